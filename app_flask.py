@@ -1,25 +1,188 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, Response, stream_with_context
 import os
 from werkzeug.utils import secure_filename
-from resume_parser import ResumeParser
+from resume_parser import ResumeParser, ExtractionCache
 from ats_analyzer import ATSAnalyzer
 from cover_letter_generator import CoverLetterGenerator
 from job_api import JobAPI
+from llm_cache import get_llm_cache
+from llm_gateway import gateway_stats
+from cache import LRUCache, SQLiteCache, TieredCache
+import base64
 import json
+import uuid
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
+JOB_INDEX_TTL = int(os.getenv('JOB_INDEX_TTL', 7 * 24 * 3600))
+# Streamed job searches keep up to this many deduplicated results for their cursor pages
+JOB_STREAM_MAX_RESULTS = int(os.getenv('JOB_STREAM_MAX_RESULTS', 200))
+JOB_STREAM_CURSOR_TTL = int(os.getenv('JOB_STREAM_CURSOR_TTL', 1800))
+
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # Initialize components
-parser = ResumeParser()
+parser = ResumeParser(cache=ExtractionCache())
 analyzer = ATSAnalyzer()
 cover_generator = CoverLetterGenerator()
 job_api = JobAPI()
+_job_index = None
+_job_store = None
+_search_results = None
+_resume_sessions = None
+
+
+def get_job_index():
+    # Opened on first use: it pulls in NumPy/SciPy and loads every posting
+    global _job_index
+    if _job_index is None:
+        from job_index import JobIndex
+        _job_index = JobIndex(model=analyzer.tfidf_model)
+    return _job_index
+
+
+def get_job_store():
+    # Opened on first use so gunicorn workers do not share the master's SQLite connection
+    global _job_store
+    if _job_store is None:
+        from job_store import JobStore
+        _job_store = JobStore()
+    return _job_store
+
+
+def get_search_results():
+    # Result sets behind /search_jobs/stream cursors, shared by all workers
+    global _search_results
+    if _search_results is None:
+        _search_results = TieredCache(
+            LRUCache(max_bytes=8 * 1024 * 1024, ttl=JOB_STREAM_CURSOR_TTL),
+            SQLiteCache(os.getenv('JOB_STREAM_CURSOR_PATH', 'cache/search_results.db'),
+                        max_bytes=64 * 1024 * 1024, ttl=JOB_STREAM_CURSOR_TTL),
+        )
+    return _search_results
+
+
+def get_resume_sessions():
+    # Opened on first use, like the job store, so each worker has its own SQLite connection
+    global _resume_sessions
+    if _resume_sessions is None:
+        from session_store import ResumeSessionStore
+        _resume_sessions = ResumeSessionStore()
+    return _resume_sessions
+
+
+def current_resume():
+    """The uploaded resume of this browser session ({'id', 'resume_text', 'artifacts'}), or None"""
+    resume_id = session.get('resume_id')
+    return get_resume_sessions().get(resume_id) if resume_id else None
+
+
+def resume_features(resume):
+    """Keywords and TF-IDF vector of the session's resume, computed once per upload"""
+    features = resume['artifacts'].get('features')
+    if features is None or features['signature'] != analyzer.tfidf_model.signature:
+        features = analyzer.resume_features(resume['resume_text'])
+        get_resume_sessions().update(resume['id'], features=features)
+    return features
+
+
+def warm_up():
+    """Load shared models before gunicorn forks workers (see gunicorn.conf.py)"""
+    # The TF-IDF model is the one scoring, prompt compression and cover letters all share
+    analyzer.warm_up()
+
+
+def wants_stream():
+    """Clients opt in to streamed output with Accept: text/event-stream"""
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+
+def stream_text(chunks, result_key):
+    """Server-Sent Events: a 'data' event per text chunk, then 'done' with the full text"""
+    def events():
+        parts = []
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield f"data: {json.dumps({'delta': chunk})}\n\n"
+            yield f"event: done\ndata: {json.dumps({result_key: ''.join(parts)})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def stream_lines(lines):
+    """NDJSON: one JSON object per line, flushed as soon as it is produced"""
+    def body():
+        try:
+            for line in lines:
+                yield json.dumps(line) + '\n'
+        except Exception as e:
+            yield json.dumps({'error': str(e)}) + '\n'
+    return Response(stream_with_context(body()), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def encode_cursor(search_id, offset):
+    return base64.urlsafe_b64encode(json.dumps([search_id, offset]).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        search_id, offset = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return str(search_id), max(0, int(offset))
+    except (TypeError, ValueError, AttributeError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+
+def search_batches(job_title, location, experience_level, per_page):
+    """Job batches for /search_jobs/stream as each provider answers, deduplicated across providers"""
+    from job_store import dedup_key
+
+    job_store = get_job_store()
+    stored = job_store.search(job_title, location, 1, JOB_STREAM_MAX_RESULTS)
+    if stored['jobs']:
+        source = 'store'
+        answers = [('store', stored['jobs'], None)]
+    else:
+        source = 'live'
+        answers = job_api.iter_search(job_title, location, experience_level)
+
+    seen = set()
+    results = []
+    providers = {}
+    for provider, jobs, status in answers:
+        new_jobs = []
+        for job in jobs:
+            key = dedup_key(job)
+            if key not in seen:
+                seen.add(key)
+                new_jobs.append(job)
+        # Only the first page is sent; the rest waits behind the cursor
+        shown = new_jobs[:max(0, per_page - len(results))]
+        results.extend(new_jobs)
+        if status is not None:
+            providers[provider] = status
+        yield {'provider': provider, 'jobs': shown, 'status': status}
+
+    results = results[:JOB_STREAM_MAX_RESULTS]
+    next_cursor = None
+    if len(results) > per_page:
+        search_id = uuid.uuid4().hex
+        get_search_results().set(search_id, json.dumps(results).encode('utf-8'))
+        next_cursor = encode_cursor(search_id, per_page)
+    yield {'done': True, 'total': len(results), 'next_cursor': next_cursor, 'source': source, 'providers': providers}
+
+    if source == 'live' and results:
+        # After 'done', so the client is not kept waiting: the next search is answered
+        # from the store, as in /search_jobs
+        job_store.add_many(results)
+        get_job_index().add_many(results, ttl=JOB_INDEX_TTL)
 
 
 @app.route('/')
@@ -38,11 +201,17 @@ def upload_resume():
     try:
         # Parse resume
         resume_text = parser.extract_text(file)
-        session['resume_text'] = resume_text
         
         # Analyze with ATS
         ats_score, feedback = analyzer.analyze_resume(resume_text)
         
+        # Only the id goes into the cookie; the text stays on the server
+        resume_sessions = get_resume_sessions()
+        if session.get('resume_id'):
+            resume_sessions.delete(session['resume_id'])
+        session.pop('resume_text', None)
+        session['resume_id'] = resume_sessions.create(resume_text, ats_score=ats_score, feedback=feedback)
+        
         return jsonify({
             'success': True,
             'ats_score': ats_score,
@@ -58,27 +227,79 @@ def match_job():
     data = request.get_json()
     job_description = data.get('job_description', '')
     
-    if not session.get('resume_text'):
+    resume = current_resume()
+    if resume is None:
         return jsonify({'error': 'No resume uploaded'}), 400
     
     try:
-        resume_text = session['resume_text']
-        analysis = analyzer.match_job_description(resume_text, job_description)
+        analysis = analyzer.match_job_description(resume['resume_text'], job_description,
+                                                  resume_features=resume_features(resume))
         return jsonify(analysis)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/rank_jobs', methods=['POST'])
+def rank_jobs():
+    data = request.get_json()
+    jobs = data.get('jobs') or data.get('job_descriptions') or []
+    try:
+        top_k = max(1, int(data.get('top_k', 10)))
+        # LLM analysis is slow and paid for, so only the very best matches get it
+        analyze_top = min(max(0, int(data.get('analyze_top', 0))), 3)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'top_k and analyze_top must be numbers'}), 400
+    
+    resume = current_resume()
+    if resume is None:
+        return jsonify({'error': 'No resume uploaded'}), 400
+    
+    try:
+        if not jobs and data.get('job_title'):
+            jobs = job_api.search_jobs(data['job_title'], data.get('location', ''), data.get('experience_level', ''))
+        if not jobs:
+            return jsonify({'error': 'Provide jobs, job_descriptions or a job_title to search for'}), 400
+        
+        ranked = analyzer.rank_jobs(resume['resume_text'], jobs, top_k=top_k, analyze_top=analyze_top,
+                                    resume_features=resume_features(resume))
+        return jsonify({'jobs': ranked, 'total': len(jobs)})
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/recommended_jobs', methods=['POST'])
+def recommended_jobs():
+    data = request.get_json(silent=True) or {}
+    try:
+        top_k = max(1, int(data.get('top_k', 10)))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'top_k must be a number'}), 400
+    
+    resume = current_resume()
+    if resume is None:
+        return jsonify({'error': 'No resume uploaded'}), 400
+    
+    try:
+        job_index = get_job_index()
+        jobs = job_index.query(resume['resume_text'], top_k=top_k)
+        return jsonify({'jobs': jobs, 'indexed': len(job_index)})
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/enhance_resume', methods=['POST'])
 def enhance_resume():
     data = request.get_json()
     target_score = data.get('target_score', 90)
     
-    if not session.get('resume_text'):
+    resume = current_resume()
+    if resume is None:
         return jsonify({'error': 'No resume uploaded'}), 400
     
     try:
-        resume_text = session['resume_text']
+        resume_text = resume['resume_text']
+        if wants_stream():
+            return stream_text(analyzer.stream_enhanced_resume(resume_text, target_score), 'enhanced_resume')
         enhanced_resume = analyzer.generate_enhanced_resume(resume_text, target_score)
         return jsonify({'enhanced_resume': enhanced_resume})
     
@@ -95,14 +316,19 @@ def generate_cover_letter():
     job_description = data.get('job_description', '')
     tone = data.get('tone', 'professional')
     
-    if not session.get('resume_text'):
+    resume = current_resume()
+    if resume is None:
         return jsonify({'error': 'No resume uploaded'}), 400
     
     if not all([company_name, position, job_description]):
         return jsonify({'error': 'Missing required fields'}), 400
     
     try:
-        resume_text = session['resume_text']
+        resume_text = resume['resume_text']
+        if wants_stream():
+            return stream_text(cover_generator.stream_cover_letter(
+                resume_text, job_description, company_name, position, tone
+            ), 'cover_letter')
         cover_letter = cover_generator.generate_cover_letter(
             resume_text, job_description, company_name, position, tone
         )
@@ -111,6 +337,35 @@ def generate_cover_letter():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/generate_cover_letters', methods=['POST'])
+def generate_cover_letters():
+    data = request.get_json(silent=True) or {}
+    company_name = data.get('company_name', '')
+    position = data.get('position', '')
+    job_description = data.get('job_description', '')
+    tones = data.get('tones') or []
+    if not isinstance(tones, list):
+        return jsonify({'error': 'tones must be a list'}), 400
+    # At most five distinct tones per request, each one is a model call (two with an industry)
+    tones = list(dict.fromkeys(str(tone) for tone in tones))[:5] or None
+    industry = data.get('industry') or None
+    
+    resume = current_resume()
+    if resume is None:
+        return jsonify({'error': 'No resume uploaded'}), 400
+    
+    if not all([company_name, position, job_description]):
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    try:
+        versions = cover_generator.generate_multiple_versions(
+            resume['resume_text'], job_description, company_name, position, tones=tones, industry=industry
+        )
+        return jsonify({'versions': versions})
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/search_jobs', methods=['POST'])
 def search_jobs():
     data = request.get_json()
@@ -122,12 +377,84 @@ def search_jobs():
         return jsonify({'error': 'Job title is required'}), 400
     
     try:
-        jobs = job_api.search_jobs(job_title, location, experience_level)
-        return jsonify({'jobs': jobs})
+        page = max(1, int(data.get('page', 1)))
+        per_page = min(50, max(1, int(data.get('per_page', 20))))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'page and per_page must be numbers'}), 400
+    
+    try:
+        # Postings ingested in the background by job_ingest.py answer without any provider call
+        job_store = get_job_store()
+        stored = job_store.search(job_title, location, page, per_page)
+        # Any match is a hit, even when this page is past the end and comes back empty
+        if stored['total']:
+            return jsonify({**stored, 'source': 'store', 'providers': {}})
+        
+        result = job_api.search_jobs_detailed(job_title, location, experience_level, limit=None)
+        jobs = result['jobs']
+        live_jobs = [job for job in jobs if job.get('source') != 'Demo']
+        if live_jobs:
+            # The next search (and the next page of this one) is answered locally
+            job_store.add_many(live_jobs)
+            # Grow the local catalog used by /recommended_jobs
+            get_job_index().add_many(live_jobs, ttl=JOB_INDEX_TTL)
+            stored = job_store.search(job_title, location, page, per_page)
+            if stored['total']:
+                return jsonify({**stored, 'source': 'live', 'providers': result['providers']})
+        start = (page - 1) * per_page
+        return jsonify({'jobs': jobs[start:start + per_page], 'total': len(jobs), 'page': page,
+                        'per_page': per_page, 'source': 'live', 'providers': result['providers']})
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/search_jobs/stream', methods=['POST'])
+def search_jobs_stream():
+    """NDJSON: a line of new (deduplicated) jobs per provider as it answers, then a 'done' line.
+
+    Pass the 'next_cursor' of the 'done' line back as 'cursor' for the next page.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        per_page = min(50, max(1, int(data.get('per_page', 20))))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'per_page must be a number'}), 400
+    
+    cursor = data.get('cursor')
+    if cursor:
+        try:
+            search_id, offset = decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        stored = get_search_results().get(search_id)
+        if stored is None:
+            return jsonify({'error': 'These results have expired, please search again'}), 410
+        results = json.loads(stored)
+        end = offset + per_page
+        return stream_lines([
+            {'provider': 'cursor', 'jobs': results[offset:end], 'status': None},
+            {'done': True, 'total': len(results), 'next_cursor': encode_cursor(search_id, end) if end < len(results) else None,
+             'source': 'cursor', 'providers': {}},
+        ])
+    
+    job_title = data.get('job_title', '')
+    if not job_title:
+        return jsonify({'error': 'Job title is required'}), 400
+    return stream_lines(search_batches(job_title, data.get('location', ''), data.get('experience_level', ''), per_page))
+
+@app.route('/metrics')
+def metrics():
+    llm_cache = get_llm_cache()
+    return jsonify({
+        'llm_cache': llm_cache.stats() if llm_cache else None,
+        'llm_gateways': gateway_stats(),
+        'extraction_cache': parser.cache.stats() if parser.cache else None,
+        'job_feature_cache': analyzer.job_feature_cache.stats(),
+        'job_provider_connections': job_api.http_stats(),
+        'job_store': get_job_store().stats(),
+        'resume_sessions': get_resume_sessions().stats(),
+    })
+
 
 
 if __name__ == '__main__':
@@ -1,27 +1,77 @@
 import re
-import nltk
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-from groq import Groq
+import hashlib
+import heapq
 import os
+import pickle
+from collections import Counter
+from concurrent.futures import wait
+from itertools import chain, islice
 from dotenv import load_dotenv
+from cache import DiskCache, LRUCache, TieredCache
+from executors import get_executor
+from keyword_matcher import TOKEN_PATTERN, KeywordMatcher
+from llm_gateway import get_gateway
+from prompt_budget import compress, shared_model
 
 # Load environment variables
 load_dotenv()
 
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+KEYWORD_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+KEYWORD_STOP_WORDS = frozenset({'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'})
+
+# Scoring patterns are compiled once at import instead of on every call
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+QUANTIFIED_PATTERN = re.compile(r'\d+%|\d+\+|\$\d+|\d+k|\d+ years?|\d+ months?', re.IGNORECASE)
+BULLET_PATTERN = re.compile(r'[•\-\*]')
+BULLET_MARKS = ('•', '-', '*')
+# One scan of the lowercased resume: every keyword-matcher token plus every bullet mark and newline.
+# Tokens start with a word character and never contain a mark, so the two cannot be confused.
+SCAN_PATTERN = re.compile(rf"{TOKEN_PATTERN.pattern}|[•\-\*\n]")
+RESUME_SECTIONS = ('experience', 'education', 'skills', 'work', 'employment')
+# "3: Use a stronger verb", "Line 3 - ..." etc. in batched line-improvement answers
+LINE_SUGGESTION_PATTERN = re.compile(r'^\s*(?:Line\s*)?(\d+)\s*[:.)-]\s*(.+?)\s*$', re.MULTILINE | re.IGNORECASE)
+
+
+def extract_keywords(text):
+    """Distinct words of four or more letters, minus common stop words"""
+    # Simple keyword extraction
+    words = KEYWORD_PATTERN.findall(text.lower())
+    return [word for word in set(words) if word not in KEYWORD_STOP_WORDS and len(word) > 3]
+
+
+_chunk_analyzer = None
+
+
+def _analyze_chunk(resume_texts):
+    """analyze_resume over a chunk of texts (process pool worker of analyze_resumes)"""
+    global _chunk_analyzer
+    if _chunk_analyzer is None:
+        # Scoring never calls Groq; a placeholder key keeps the client constructor happy
+        _chunk_analyzer = ATSAnalyzer(groq_api_key=os.getenv('GROQ_API_KEY') or 'batch-mode', llm_priority='batch')
+    return [_chunk_analyzer.analyze_resume(text) for text in resume_texts]
+
+
+def job_text(job):
+    """Title and description of a job dict as plain text"""
+    text = f"{job.get('title', '')}\n{job.get('description', '')}"
+    # Some providers return HTML descriptions
+    return HTML_TAG_PATTERN.sub(' ', text).strip()
+
+
+def _job_features_size(features):
+    vector = features['vector']
+    return len(features['text']) + vector.data.nbytes + vector.indices.nbytes + 64 * len(features['keywords'])
+
+
 class ATSAnalyzer:
-    def __init__(self, groq_api_key=None):
-        try:
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-        except (LookupError, OSError, ConnectionError) as e:
-            print(f"Warning: Could not download NLTK data: {e}")
-        
-        # Initialize Groq client
-        self.groq_client = Groq(
-            api_key=groq_api_key or os.getenv('GROQ_API_KEY')
-        )
+
+    def __init__(self, groq_api_key=None, llm_priority='interactive'):
+        # Shared, rate-limited Groq gateway (see llm_gateway.py)
+        self.llm = get_gateway(groq_api_key)
+        self.groq_client = self.llm.client
+        self.llm_priority = llm_priority
         self.model = os.getenv('GROQ_MODEL', 'llama3-8b-8192')
         
         # Common ATS-friendly keywords
@@ -30,36 +80,69 @@ class ATSAnalyzer:
             'responsibilities', 'managed', 'developed', 'implemented', 'created',
             'improved', 'increased', 'reduced', 'led', 'collaborated'
         ]
+        # Keyword dictionaries are compiled once into automata and scanned in a single pass
+        self.keyword_matcher = KeywordMatcher(self.ats_keywords)
+        taxonomy_path = os.getenv('SKILL_TAXONOMY_PATH')
+        self.skill_matcher = KeywordMatcher.from_file(taxonomy_path) if taxonomy_path else None
+        self._tfidf_model = None
+        # Job-description side features, shared by every user matching the same posting
+        ttl = int(os.getenv('JOB_FEATURE_CACHE_TTL', 6 * 3600))
+        self.job_feature_cache = TieredCache(
+            LRUCache(max_bytes=int(os.getenv('JOB_FEATURE_CACHE_MEMORY_BYTES', 32 * 1024 * 1024)),
+                     sizeof=_job_features_size, ttl=ttl),
+            DiskCache(os.getenv('JOB_FEATURE_CACHE_DIR', 'cache/job_features'),
+                      max_bytes=int(os.getenv('JOB_FEATURE_CACHE_DISK_BYTES', 256 * 1024 * 1024)), ttl=ttl),
+            encode=pickle.dumps,
+            decode=pickle.loads,
+        )
     
+    def _complete(self, messages, model, **params):
+        """Chat completion text through the shared gateway, cached for repeated prompts"""
+        return self.llm.complete(messages, model, priority=self.llm_priority, **params)
+
+    @property
+    def tfidf_model(self):
+        """Pre-fit TF-IDF model (see tfidf_model.py), the process-wide one prompt compression
+        also uses, loaded on first use so that scikit-learn and NumPy are not imported by
+        processes that only score resumes"""
+        if self._tfidf_model is None:
+            self._tfidf_model = shared_model()
+        return self._tfidf_model
+
+    def warm_up(self):
+        """Load the lazily imported models now, e.g. in the gunicorn master before forking"""
+        self.tfidf_model.transform(['warm up'])
+
     def analyze_resume(self, resume_text):
         """Analyze resume and return ATS score with feedback"""
+        signals = self._score_signals(resume_text)
         score = 0
         feedback = []
         
         # Check basic structure (30 points)
-        if self._has_contact_info(resume_text):
+        if signals['contact_info']:
             score += 10
         else:
             feedback.append("Add clear contact information (email, phone)")
         
-        if self._has_sections(resume_text):
+        if signals['sections']:
             score += 10
         else:
             feedback.append("Include standard sections: Experience, Education, Skills")
         
-        if self._has_quantified_achievements(resume_text):
+        if signals['quantified_achievements']:
             score += 10
         else:
             feedback.append("Add quantified achievements (numbers, percentages)")
         
         # Check keywords (40 points)
-        keyword_score = self._calculate_keyword_score(resume_text)
+        keyword_score = signals['keyword_score']
         score += keyword_score
         if keyword_score < (40 * 0.75):
             feedback.append("Include more action verbs and industry keywords")
         
         # Check formatting (30 points)
-        format_score = self._check_formatting(resume_text)
+        format_score = signals['format_score']
         score += format_score
         if format_score < 20:
             feedback.append("Improve formatting: use bullet points, consistent spacing")
@@ -68,8 +151,86 @@ class ATSAnalyzer:
             feedback.append("Great job! Your resume is ATS-friendly")
         
         return min(score, 100), feedback
+
+    def analyze_resumes(self, resume_texts, workers=None, chunk_size=256):
+        """Score many resumes; returns a list of (score, feedback) tuples in input order.
+
+        Identical texts are scored once. With ``workers`` > 1 (SCORING_WORKERS)
+        and more than one chunk of distinct texts, chunks are scored in a
+        shared process pool; otherwise in this process.
+        """
+        workers = workers if workers is not None else int(os.getenv('SCORING_WORKERS', 0))
+        unique = list(dict.fromkeys(resume_texts))
+        if workers > 1 and len(unique) > chunk_size:
+            chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+            executor = get_executor('resume-scoring', workers, processes=True)
+            results = chain.from_iterable(executor.map(_analyze_chunk, chunks))
+        else:
+            results = map(self.analyze_resume, unique)
+        scored = dict(zip(unique, results))
+        return [(scored[text][0], list(scored[text][1])) for text in resume_texts]
+
+    def _score_signals(self, text):
+        """Compute every scoring signal for one resume.
+
+        A single SCAN_PATTERN pass over the lowercased text yields the token
+        counts and the bullet and newline counts. The token counts feed the
+        section check (a section name occurs in the text exactly when it
+        occurs in one of its tokens) and the keyword matcher, and the marks
+        feed the formatting score. Contact details and quantified
+        achievements keep their own regexes, which stop at the first hits
+        that decide them; merged into the scan they could hide each other.
+        """
+        tokens = Counter(SCAN_PATTERN.findall(text.lower()))
+        newlines = tokens.pop('\n', 0)
+        has_bullets = False
+        for mark in BULLET_MARKS:
+            has_bullets = tokens.pop(mark, 0) > 0 or has_bullets
+        vocabulary = ' '.join(tokens)
+        if self.keyword_matcher.max_tokens > 1:
+            keyword_counts = self.keyword_matcher.counts(text)
+        else:
+            keyword_counts = self.keyword_matcher.count_tokens(tokens)
+        return {
+            'contact_info': self._has_contact_info(text),
+            'sections': self._has_sections(text, vocabulary),
+            'quantified_achievements': self._has_quantified_achievements(text),
+            'keyword_score': self._calculate_keyword_score(text, keyword_counts),
+            'format_score': self._format_score(len(text), newlines, has_bullets),
+        }
+
+    def keyword_report(self, text):
+        """Counts and positions of the ATS keywords found in text, plus the ones missing"""
+        positions = self.keyword_matcher.match(text)
+        return {
+            'counts': {keyword: len(spans) for keyword, spans in positions.items()},
+            'positions': positions,
+            'missing': self.keyword_matcher.missing(positions),
+        }
+
+    def skill_gap(self, resume_text, job_description):
+        """Taxonomy skills mentioned in the job description but not in the resume, most frequent first"""
+        if self.skill_matcher is None:
+            return []
+        job_skills = self.skill_matcher.counts(job_description)
+        resume_skills = self.skill_matcher.counts(resume_text)
+        return [skill for skill, _ in job_skills.most_common() if skill not in resume_skills]
     
-    def match_job_description(self, resume_text, job_description):
+    def resume_features(self, resume_text):
+        """Keywords and TF-IDF vector of a resume, for reuse across match_job_description and rank_jobs"""
+        return {
+            'signature': self.tfidf_model.signature,
+            'keywords': self._extract_keywords(resume_text.lower()),
+            'vector': self.tfidf_model.transform([resume_text]),
+        }
+
+    def _resume_features(self, resume_text, features=None):
+        # Features computed by an older model cannot be compared with current job vectors
+        if features is None or features.get('signature') != self.tfidf_model.signature:
+            return self.resume_features(resume_text)
+        return features
+
+    def match_job_description(self, resume_text, job_description, resume_features=None):
         """Enhanced job description matching with comprehensive analysis"""
         if not job_description or len(job_description.strip()) < 50:
             return {
@@ -80,10 +241,10 @@ class ATSAnalyzer:
             }
         
         try:
-            # Use TF-IDF to find similarity
-            vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2), max_features=1000)
-            tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+            # Use TF-IDF to find similarity; the job side comes from the shared feature cache
+            job_features = self._job_features([job_description])[0]
+            resume_features = self._resume_features(resume_text, resume_features)
+            similarity = (resume_features['vector'] @ job_features['vector'].T)[0, 0]
             match_score = int(similarity * 100)
         except Exception as e:
             return {
@@ -94,69 +255,189 @@ class ATSAnalyzer:
             }
         
         # Extract and analyze keywords
-        job_keywords = self._extract_keywords(job_description)
-        resume_keywords = self._extract_keywords(resume_text.lower())
-        missing_keywords = [kw for kw in job_keywords[:15] if kw not in resume_keywords]
+        missing_keywords = self._missing_keywords(job_features['keywords'], resume_features['keywords'])
         
         # Get comprehensive AI analysis
         analysis = self._get_comprehensive_analysis(resume_text, job_description, match_score)
         
-        return {
+        result = {
             'match_score': match_score,
             'missing_keywords': missing_keywords,
             'suggestions': analysis['suggestions'],
             'improvements': analysis['improvements'],
             'strengths': analysis['strengths']
         }
+        if self.skill_matcher is not None:
+            result['missing_skills'] = self.skill_gap(resume_text, job_description)
+        return result
+    
+    def rank_jobs(self, resume_text, jobs, top_k=10, analyze_top=0, resume_features=None):
+        """Rank many job postings against one resume.
+
+        ``jobs`` are job dicts as returned by JobAPI.search_jobs (or plain
+        description strings). All postings are vectorized in one batch and
+        scored with a single sparse matrix-vector product; only the best
+        ``analyze_top`` results get an LLM analysis.
+        """
+        import numpy as np
+
+        jobs = [job if isinstance(job, dict) else {'description': job} for job in jobs]
+        if not jobs:
+            return []
+
+        import scipy.sparse as sp
+
+        job_texts = [self._job_text(job) for job in jobs]
+        job_features = self._job_features(job_texts)
+        job_matrix = sp.vstack([features['vector'] for features in job_features], format='csr')
+        resume_features = self._resume_features(resume_text, resume_features)
+        scores = (job_matrix @ resume_features['vector'].T).toarray().ravel()
+
+        top_k = min(top_k, len(jobs))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        resume_keywords = resume_features['keywords']
+        ranked = []
+        for rank, index in enumerate(top):
+            match_score = int(scores[index] * 100)
+            result = dict(jobs[index])
+            result['match_score'] = match_score
+            result['missing_keywords'] = self._missing_keywords(job_features[index]['keywords'], resume_keywords)
+            if rank < analyze_top:
+                result.update(self._get_comprehensive_analysis(resume_text, job_texts[index], match_score))
+            ranked.append(result)
+        return ranked
+
+    def rank_resumes(self, job_description, resumes, top_k=50, chunk_size=500):
+        """Recruiter mode: best matching resumes from a large pool for one job description.
+
+        ``resumes`` is any iterable of texts or (resume_id, text) pairs and is
+        consumed in chunks of ``chunk_size``. Each chunk is scored as one
+        sparse matrix and only a heap of the ``top_k`` best candidates is
+        kept, so peak memory stays flat however large the pool is.
+        """
+        if top_k <= 0:
+            return []
+        import numpy as np
+
+        job_vector = self.tfidf_model.transform([job_description])
+        heap = []  # (score, sequence, resume_id, text), smallest score first
+        sequence = 0
+        resumes = iter(resumes)
+        while True:
+            chunk = list(islice(resumes, chunk_size))
+            if not chunk:
+                break
+            chunk = [item if isinstance(item, tuple) else (sequence + i, item) for i, item in enumerate(chunk)]
+            scores = (self.tfidf_model.transform([text for _, text in chunk]) @ job_vector.T).toarray().ravel()
+
+            # Only candidates that beat the current k-th best can enter the heap
+            threshold = heap[0][0] if len(heap) >= top_k else -1.0
+            for i in np.flatnonzero(scores > threshold):
+                entry = (float(scores[i]), sequence + int(i), chunk[i][0], chunk[i][1])
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry[0] > heap[0][0]:
+                    heapq.heapreplace(heap, entry)
+            sequence += len(chunk)
+
+        job_keywords = self._extract_keywords(job_description)
+        return [
+            {
+                'resume_id': resume_id,
+                'match_score': int(score * 100),
+                'missing_keywords': self._missing_keywords(job_keywords, self._extract_keywords(text.lower())),
+            }
+            for score, _, resume_id, text in sorted(heap, key=lambda entry: (-entry[0], entry[1]))
+        ]
+
+    def _job_features(self, job_descriptions):
+        """Normalized text, keywords and TF-IDF vector for each job description.
+
+        Features are cached by a hash of the normalized description (and the
+        model signature), so popular postings are processed once for all
+        users and workers; cache misses are vectorized in a single batch.
+        """
+        normalized = [' '.join(description.split()) for description in job_descriptions]
+        keys = [hashlib.sha256(f"{self.tfidf_model.signature}:{text}".encode('utf-8')).hexdigest()
+                for text in normalized]
+        features = [self.job_feature_cache.get(key) for key in keys]
+
+        missing = [i for i, cached in enumerate(features) if cached is None]
+        if missing:
+            vectors = self.tfidf_model.transform([normalized[i] for i in missing])
+            for row, i in enumerate(missing):
+                features[i] = {
+                    'text': normalized[i],
+                    'keywords': self._extract_keywords(normalized[i]),
+                    'vector': vectors[row],
+                }
+                self.job_feature_cache.set(keys[i], features[i])
+        return features
+
+    def _job_text(self, job):
+        return job_text(job)
+
+    def _missing_keywords(self, job_keywords, resume_keywords, limit=15):
+        return [kw for kw in job_keywords[:limit] if kw not in resume_keywords]
     
     def _has_contact_info(self, text):
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        return bool(re.search(email_pattern, text)) and bool(re.search(phone_pattern, text))
+        return EMAIL_PATTERN.search(text) is not None and PHONE_PATTERN.search(text) is not None
     
-    def _has_sections(self, text):
-        sections = ['experience', 'education', 'skills', 'work', 'employment']
-        return sum(1 for section in sections if section in text.lower()) >= 2
+    def _has_sections(self, text, lowered=None):
+        # lowered: the lowercased text, or its distinct tokens joined by spaces
+        lowered = lowered if lowered is not None else text.lower()
+        found = 0
+        for section in RESUME_SECTIONS:
+            if section in lowered:
+                found += 1
+                if found >= 2:
+                    return True
+        return False
     
     def _has_quantified_achievements(self, text):
-        number_pattern = r'\d+%|\d+\+|\$\d+|\d+k|\d+ years?|\d+ months?'
-        return len(re.findall(number_pattern, text, re.IGNORECASE)) >= 3
+        # Only the first three matches matter, so stop scanning once they are found
+        return sum(1 for _ in islice(QUANTIFIED_PATTERN.finditer(text), 3)) >= 3
     
-    def _calculate_keyword_score(self, text):
+    def _calculate_keyword_score(self, text, keyword_counts=None):
         if not self.ats_keywords:
             return 0
-        text_lower = text.lower()
-        found_keywords = sum(1 for keyword in self.ats_keywords if keyword in text_lower)
+        if keyword_counts is None:
+            keyword_counts = self.keyword_matcher.counts(text)
+        found_keywords = len(keyword_counts)
         return min(int((found_keywords / len(self.ats_keywords)) * 40), 40)
     
     def _check_formatting(self, text):
+        return self._format_score(len(text), text.count('\n'), BULLET_PATTERN.search(text) is not None)
+
+    def _format_score(self, length, newlines, has_bullets):
         score = 30
-        if len(text) < 200:
+        if length < 200:
             score -= 10
-        if text.count('\n') < 5:
+        if newlines < 5:
             score -= 10
-        if not re.search(r'[•\-\*]', text):
+        if not has_bullets:
             score -= 10
         return max(score, 0)
     
     def _extract_keywords(self, text):
-        # Simple keyword extraction
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-        # Filter common words
-        stop_words = {'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'}
-        return [word for word in set(words) if word not in stop_words and len(word) > 3]
+        return extract_keywords(text)
     
     def _get_comprehensive_analysis(self, resume_text, job_description, match_score):
         """Get comprehensive AI-powered analysis using Groq"""
         try:
+            # The most relevant parts of each document, instead of whatever fits in the first 1500 characters
+            job_excerpt = compress(job_description, resume_text, budget_tokens=350, model=self.tfidf_model)
+            resume_excerpt = compress(resume_text, job_description, budget_tokens=350, model=self.tfidf_model)
             prompt = f"""
 As an expert ATS and career coach, analyze this resume against the job description. Provide a comprehensive analysis:
 
 Job Description:
-{job_description[:1500]}
+{job_excerpt}
 
 Resume:
-{resume_text[:1500]}
+{resume_excerpt}
 
 Match Score: {match_score}%
 
@@ -174,7 +455,7 @@ SUGGESTIONS:
 Focus on specific, actionable advice that will improve ATS compatibility and job match.
 """
             
-            response = self.groq_client.chat.completions.create(
+            analysis_text = self._complete(
                 messages=[
                     {"role": "system", "content": "You are an expert ATS specialist and career coach. Provide detailed, actionable resume optimization advice."},
                     {"role": "user", "content": prompt}
@@ -184,7 +465,6 @@ Focus on specific, actionable advice that will improve ATS compatibility and job
                 temperature=0.2
             )
             
-            analysis_text = response.choices[0].message.content
             return self._parse_analysis(analysis_text)
             
         except Exception as e:
@@ -266,11 +546,37 @@ Focus on specific, actionable advice that will improve ATS compatibility and job
     def generate_enhanced_resume(self, resume_text, target_score=90):
         """Generate AI-enhanced resume with higher ATS score"""
         try:
-            prompt = f"""
+            return self._complete(
+                messages=self._enhanced_resume_messages(resume_text, target_score),
+                model=self.model,
+                max_tokens=1500,
+                temperature=0.3
+            )
+            
+        except Exception as e:
+            print(f"Groq API error: {e}")
+            return self._get_fallback_enhanced_resume(resume_text)
+
+    def stream_enhanced_resume(self, resume_text, target_score=90):
+        """Yield the enhanced resume in chunks as the model writes it"""
+        started = False
+        try:
+            for chunk in self.llm.stream(self._enhanced_resume_messages(resume_text, target_score), self.model,
+                                         priority=self.llm_priority, max_tokens=1500, temperature=0.3):
+                started = True
+                yield chunk
+        except Exception as e:
+            print(f"Groq API error: {e}")
+            if started:
+                raise
+            yield self._get_fallback_enhanced_resume(resume_text)
+
+    def _enhanced_resume_messages(self, resume_text, target_score):
+        prompt = f"""
 As an expert resume writer and ATS specialist, enhance this resume to achieve a {target_score}% ATS score.
 
 Original Resume:
-{resume_text[:2000]}
+{compress(resume_text, budget_tokens=500, model=self.tfidf_model)}
 
 Provide an enhanced version with:
 1. Stronger action verbs
@@ -281,62 +587,109 @@ Provide an enhanced version with:
 
 Return the enhanced resume in the same structure but with improved content.
 """
-            
-            response = self.groq_client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are an expert resume writer specializing in ATS optimization. Enhance resumes while maintaining their original structure and truthfulness."},
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.model,
-                max_tokens=1500,
-                temperature=0.3
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            print(f"Groq API error: {e}")
-            return self._get_fallback_enhanced_resume(resume_text)
+        return [
+            {"role": "system", "content": "You are an expert resume writer specializing in ATS optimization. Enhance resumes while maintaining their original structure and truthfulness."},
+            {"role": "user", "content": prompt}
+        ]
     
-    def get_line_improvements(self, resume_text):
-        """Get line-by-line improvement suggestions"""
+    def get_line_improvements(self, resume_text, mode=None, deadline=None):
+        """Get line-by-line improvement suggestions.
+
+        'batch' mode (the default) asks about every line in one structured
+        prompt. 'concurrent' mode sends one request per line through a
+        bounded thread pool and returns whatever finished within the deadline.
+        """
+        lines = [(i, line.strip()) for i, line in enumerate(resume_text.split('\n')[:20], 1)  # Limit to first 20 lines
+                 if len(line.strip()) > 10]  # Only analyze substantial lines
+        if not lines:
+            return []
+        mode = mode or os.getenv('LINE_IMPROVEMENT_MODE', 'batch')
         try:
-            lines = resume_text.split('\n')
-            improvements = []
-            
-            for i, line in enumerate(lines[:20], 1):  # Limit to first 20 lines
-                if len(line.strip()) > 10:  # Only analyze substantial lines
-                    prompt = f"""
+            if mode == 'concurrent':
+                if deadline is None:
+                    deadline = float(os.getenv('LINE_IMPROVEMENT_DEADLINE', 15))
+                return self._line_improvements_concurrent(lines, deadline)
+            return self._line_improvements_batch(lines)
+        except Exception as e:
+            print(f"Groq API error: {e}")
+            return self._get_fallback_line_improvements(resume_text)
+
+    def _line_improvements_batch(self, lines):
+        numbered = '\n'.join(f'Line {i}: "{line}"' for i, line in lines)
+        prompt = f"""
+Analyze each of these resume lines and suggest ONE specific improvement per line:
+
+{numbered}
+
+Provide a brief, actionable suggestion for each line to make it more ATS-friendly and impactful.
+Answer with exactly one line per resume line, in the same order.
+Format: "<line number>: [your improvement]"
+"""
+
+        content = self._complete(
+            messages=[
+                {"role": "system", "content": "You are an ATS expert. Provide one specific, actionable improvement per resume line."},
+                {"role": "user", "content": prompt}
+            ],
+            model=self.model,
+            max_tokens=60 * len(lines) + 40,
+            temperature=0.2
+        )
+
+        suggestions = {}
+        for match in LINE_SUGGESTION_PATTERN.finditer(content):
+            suggestions.setdefault(int(match.group(1)), match.group(2).replace("Suggestion: ", "").strip())
+        return [{
+            'line_number': i,
+            'original': line,
+            # Lines the model skipped get the generic advice rather than disappearing
+            'suggestion': suggestions.get(i) or 'Add quantified results and stronger action verbs'
+        } for i, line in lines]
+
+    def _line_improvements_concurrent(self, lines, deadline):
+        executor = get_executor('line-improvement', int(os.getenv('LINE_IMPROVEMENT_WORKERS', 5)))
+        futures = {executor.submit(self._improve_line, i, line): (i, line) for i, line in lines}
+        done, pending = wait(futures, timeout=deadline)
+        for future in pending:
+            future.cancel()
+        if pending:
+            print(f"Line improvements: {len(pending)} of {len(futures)} lines missed the {deadline}s deadline")
+
+        improvements = []
+        for future in done:
+            try:
+                improvements.append(future.result())
+            except Exception as e:
+                print(f"Groq API error: {e}")
+        if not improvements:
+            raise TimeoutError(f"no line improvements within {deadline}s")
+        return sorted(improvements, key=lambda improvement: improvement['line_number'])
+
+    def _improve_line(self, i, line):
+        prompt = f"""
 Analyze this resume line and suggest ONE specific improvement:
 
-Line {i}: "{line.strip()}"
+Line {i}: "{line}"
 
 Provide a brief, actionable suggestion to make it more ATS-friendly and impactful.
 Format: "Suggestion: [your improvement]"
 """
-                    
-                    response = self.groq_client.chat.completions.create(
-                        messages=[
-                            {"role": "system", "content": "You are an ATS expert. Provide one specific, actionable improvement per resume line."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        model=self.model,
-                        max_tokens=100,
-                        temperature=0.2
-                    )
-                    
-                    suggestion = response.choices[0].message.content.replace("Suggestion: ", "")
-                    improvements.append({
-                        'line_number': i,
-                        'original': line.strip(),
-                        'suggestion': suggestion
-                    })
-            
-            return improvements
-            
-        except Exception as e:
-            print(f"Groq API error: {e}")
-            return self._get_fallback_line_improvements(resume_text)
+
+        content = self._complete(
+            messages=[
+                {"role": "system", "content": "You are an ATS expert. Provide one specific, actionable improvement per resume line."},
+                {"role": "user", "content": prompt}
+            ],
+            model=self.model,
+            max_tokens=100,
+            temperature=0.2
+        )
+
+        return {
+            'line_number': i,
+            'original': line,
+            'suggestion': content.replace("Suggestion: ", "")
+        }
     
     def _get_fallback_enhanced_resume(self, resume_text):
         """Fallback enhanced resume when AI is unavailable"""
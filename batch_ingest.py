@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Score a directory or archive of resumes in bulk and stream the results as JSONL.
+
+    python batch_ingest.py resumes/ -o results.jsonl --workers 8
+    python batch_ingest.py resumes.zip -o results.jsonl
+
+Finished inputs are recorded in a checkpoint file (``<output>.checkpoint``
+by default), so re-running the same command after an interruption only
+processes the files that are still missing.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+_parser = None
+_analyzer = None
+_archives = {}
+
+
+class NamedBytesIO(io.BytesIO):
+    """In-memory upload that ResumeParser can read like a Flask FileStorage"""
+
+    def __init__(self, data, filename):
+        super().__init__(data)
+        self.filename = filename
+
+
+def iter_sources(path):
+    """Yield (source_id, location) pairs for every supported resume under path"""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    file_path = os.path.join(root, name)
+                    yield file_path, ('file', file_path)
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield f"{path}!{info.filename}", ('zip', path, info.filename)
+    elif tarfile.is_tarfile(path):
+        # Compressed tars have no random access, so members are read here and shipped as bytes
+        with tarfile.open(path) as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield f"{path}!{member.name}", ('bytes', member.name, archive.extractfile(member).read())
+    else:
+        raise ValueError(f"{path} is not a directory, zip or tar archive")
+
+
+def _read_source(location):
+    kind = location[0]
+    if kind == 'file':
+        with open(location[1], 'rb') as f:
+            return os.path.basename(location[1]), f.read()
+    if kind == 'zip':
+        archive = _archives.get(location[1])
+        if archive is None:
+            archive = _archives[location[1]] = zipfile.ZipFile(location[1])
+        return os.path.basename(location[2]), archive.read(location[2])
+    return os.path.basename(location[1]), location[2]
+
+
+def _init_worker():
+    global _parser, _analyzer
+    from resume_parser import ResumeParser
+    from ats_analyzer import ATSAnalyzer
+
+    _parser = ResumeParser()
+    # analyze_resume never calls Groq; a placeholder key keeps the client constructor happy
+    _analyzer = ATSAnalyzer(groq_api_key=os.getenv('GROQ_API_KEY') or 'batch-mode', llm_priority='batch')
+
+
+def process_resume(source_id, location):
+    """Extract and score one resume (runs inside a pool worker)"""
+    started = time.perf_counter()
+    try:
+        filename, data = _read_source(location)
+        read_done = time.perf_counter()
+        text = _parser.extract_text(NamedBytesIO(data, filename))
+        extract_done = time.perf_counter()
+        ats_score, feedback = _analyzer.analyze_resume(text)
+        score_done = time.perf_counter()
+    except Exception as e:
+        return {'id': source_id, 'error': str(e)}
+
+    return {
+        'id': source_id,
+        'text_length': len(text),
+        'ats_score': ats_score,
+        'feedback': feedback,
+        'timings': {
+            'read_ms': round((read_done - started) * 1000, 2),
+            'extract_ms': round((extract_done - read_done) * 1000, 2),
+            'score_ms': round((score_done - extract_done) * 1000, 2),
+        },
+    }
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+def run(input_path, output_path, checkpoint_path=None, workers=None, max_in_flight=None):
+    """Process every resume under input_path that is not in the checkpoint yet"""
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    done = load_checkpoint(checkpoint_path)
+    stats = {'processed': 0, 'skipped': 0, 'errors': 0}
+    started = time.perf_counter()
+
+    with open(output_path, 'a', encoding='utf-8') as output, \
+            open(checkpoint_path, 'a', encoding='utf-8') as checkpoint, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending = set()
+
+        def drain(return_when):
+            finished, still_pending = wait(pending, return_when=return_when)
+            for future in finished:
+                result = future.result()
+                output.write(json.dumps(result) + '\n')
+                output.flush()
+                # Only checkpoint once the result line is on disk
+                checkpoint.write(result['id'] + '\n')
+                checkpoint.flush()
+                stats['processed'] += 1
+                if 'error' in result:
+                    stats['errors'] += 1
+            return still_pending
+
+        for source_id, location in iter_sources(input_path):
+            if source_id in done:
+                stats['skipped'] += 1
+                continue
+            # Bound the number of queued inputs so large archives are not loaded all at once
+            if len(pending) >= max_in_flight:
+                pending = drain(FIRST_COMPLETED)
+            pending.add(executor.submit(process_resume, source_id, location))
+
+        if pending:
+            drain(ALL_COMPLETED)
+
+    elapsed = time.perf_counter() - started
+    stats['elapsed_s'] = round(elapsed, 2)
+    stats['files_per_s'] = round(stats['processed'] / elapsed, 2) if elapsed else 0.0
+    return stats
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Bulk resume extraction and ATS scoring")
+    arg_parser.add_argument('input', help="Directory, .zip or .tar(.gz) archive of resumes")
+    arg_parser.add_argument('-o', '--output', default='results.jsonl', help="JSONL file results are appended to")
+    arg_parser.add_argument('--checkpoint', help="Checkpoint file (default: <output>.checkpoint)")
+    arg_parser.add_argument('-w', '--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = arg_parser.parse_args(argv)
+
+    stats = run(args.input, args.output, args.checkpoint, args.workers)
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
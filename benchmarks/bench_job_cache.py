@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""JobAPI result cache and Arbeitnow snapshot against local stub providers.
+
+    python benchmarks/bench_job_cache.py --latency adzuna=0.3 jsearch=0.5 remotive=1 arbeitnow=0.8
+
+Runs one search per cache state: 'miss' (empty cache, every provider
+called), 'fresh' (answered from the cache), 'stale' (past JOB_CACHE_TTL,
+answered from the cache while a background refresh runs) and 'stale,
+providers down' (every stub failing). Then times searches of the Arbeitnow
+snapshot against the old download-and-filter on every search.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_job_providers import StubJobProviders, _pairs
+
+
+def run(api, label, title):
+    start = time.perf_counter()
+    result = api.search_jobs_detailed(title)
+    elapsed = time.perf_counter() - start
+    states = ' '.join(f"{name}={status['cache']}" for name, status in result['providers'].items())
+    print(f"{label:<24}{elapsed * 1000:>9.1f} ms  {len(result['jobs']):>3} jobs  {states}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--latency', nargs='*', default=['adzuna=0.3', 'jsearch=0.5', 'remotive=1', 'arbeitnow=0.8'],
+                            help="provider=seconds")
+    arg_parser.add_argument('--board-size', type=int, default=1000, help="Arbeitnow postings")
+    arg_parser.add_argument('--title', default='Python Developer')
+    arg_parser.add_argument('--searches', type=int, default=200)
+    args = arg_parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    with StubJobProviders(_pairs(args.latency, float), count={'arbeitnow': args.board_size}) as stubs:
+        os.environ.update(stubs.environ())
+        os.environ['JOB_CACHE_PATH'] = os.path.join(work_dir, 'job_search.db')
+        os.environ['ARBEITNOW_SNAPSHOT_PATH'] = os.path.join(work_dir, 'arbeitnow_snapshot.json')
+        from job_api import JobAPI
+
+        api = JobAPI()
+        print(f"{'search':<24}{'time':>12}{'':>10}cache")
+        run(api, 'miss', args.title)
+        run(api, 'fresh', args.title)
+        api.cache_ttl = 0
+        api.arbeitnow_snapshot.refresh_interval = 0
+        run(api, 'stale', args.title)
+        time.sleep(max(provider.latency for provider in stubs.providers.values()) + 0.2)
+        for provider in stubs.providers.values():
+            provider.status = 500
+        run(api, 'stale, providers down', args.title)
+        for provider in stubs.providers.values():
+            provider.status = 200
+
+        queries = ['Python Developer', 'data engineer', 'Machine Learning', 'devops', 'Product Manager']
+        start = time.perf_counter()
+        for i in range(args.searches):
+            api.arbeitnow_snapshot.search(queries[i % len(queries)])
+        snapshot_ms = (time.perf_counter() - start) * 1000 / args.searches
+
+        start = time.perf_counter()
+        for query in queries:
+            title = query.lower()
+            [job for job in api._fetch_arbeitnow_board() if title in job['title'].lower()]
+        download_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        print(f"\nArbeitnow search over {len(api.arbeitnow_snapshot)} postings")
+        print(f"  download and filter  {download_ms:9.1f} ms/search")
+        print(f"  snapshot index       {snapshot_ms:9.3f} ms/search")
+
+
+if __name__ == '__main__':
+    main()
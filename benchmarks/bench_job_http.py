@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Bare requests.get against JobAPI's pooled provider sessions.
+
+    python benchmarks/bench_job_http.py --searches 50 --handshake 0.05
+
+Calls every provider's search method --searches times from --workers
+threads, first with a new connection per request (what requests.get does)
+and then through the keep-alive sessions, and reports the time, the
+connections the stub servers accepted and the bytes they sent. The stubs
+speak plain HTTP; --handshake delays each new connection's first answer
+to stand in for the TLS handshake of the real APIs.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_job_providers import StubJobProviders
+
+
+def run(api, stubs, label, searches, workers):
+    for provider in stubs.providers.values():
+        provider.reset_stats()
+    calls = [lambda: api._search_adzuna('Python Developer', ''), lambda: api._search_jsearch('Python Developer', ''),
+             lambda: api._search_remotive('Python Developer')]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(calls[i % len(calls)]) for i in range(searches * len(calls))]:
+            future.result()
+    elapsed = time.perf_counter() - start
+    connections = sum(provider.stats['connections'] for provider in stubs.providers.values())
+    sent = sum(provider.stats['bytes_sent'] for provider in stubs.providers.values())
+    print(f"{label:<18}{elapsed:>8.2f}s{connections:>13}{sent / 1024:>12.0f} KiB")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--searches', type=int, default=50, help="requests per provider")
+    arg_parser.add_argument('--workers', type=int, default=4)
+    arg_parser.add_argument('--latency', type=float, default=0.02)
+    arg_parser.add_argument('--handshake', type=float, default=0.05)
+    args = arg_parser.parse_args()
+
+    latency = {name: args.latency for name in ('adzuna', 'jsearch', 'remotive', 'arbeitnow')}
+    with StubJobProviders(latency, handshake=args.handshake) as stubs:
+        os.environ.update(stubs.environ())
+        work_dir = tempfile.mkdtemp()
+        os.environ['JOB_CACHE_PATH'] = os.path.join(work_dir, 'job_search.db')
+        os.environ['ARBEITNOW_SNAPSHOT_PATH'] = os.path.join(work_dir, 'arbeitnow_snapshot.json')
+        from job_api import JobAPI
+
+        api = JobAPI()
+        sessions = api.sessions
+        print(f"{'':<18}{'time':>9}{'connections':>13}{'sent':>16}")
+        # The requests module has the same get() as a Session, without keeping connections
+        api.sessions = {name: requests for name in sessions}
+        run(api, stubs, 'requests.get', args.searches, args.workers)
+        api.sessions = sessions
+        run(api, stubs, 'pooled sessions', args.searches, args.workers)
+        for name, stats in api.http_stats().items():
+            print(f"  {name:<10} {stats['requests']:>4} requests {stats['new_connections']:>3} new connections  "
+                  f"reuse {stats['reuse_rate']:.0%}  handshake avg {stats['avg_handshake_ms']} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""JobAPI provider fan-out against local stub providers.
+
+    python benchmarks/bench_job_search.py --latency adzuna=0.3 jsearch=0.5 remotive=4 arbeitnow=0.4 --deadline 2
+
+'sequential' calls the providers one after another as search_jobs used to;
+'concurrent' is search_jobs_detailed with its overall deadline.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_job_providers import StubJobProviders, _pairs
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--latency', nargs='*', default=['adzuna=0.3', 'jsearch=0.5', 'remotive=4', 'arbeitnow=0.4'],
+                            help="provider=seconds")
+    arg_parser.add_argument('--status', nargs='*', default=[], help="provider=http status")
+    arg_parser.add_argument('--deadline', type=float, default=2.0)
+    arg_parser.add_argument('--title', default='Python Developer')
+    args = arg_parser.parse_args()
+
+    with StubJobProviders(_pairs(args.latency, float), _pairs(args.status, int)) as stubs:
+        os.environ.update(stubs.environ())
+        os.environ['JOB_SEARCH_DEADLINE'] = str(args.deadline)
+        # Start cold: nothing cached from an earlier run
+        work_dir = tempfile.mkdtemp()
+        os.environ['JOB_CACHE_PATH'] = os.path.join(work_dir, 'job_search.db')
+        os.environ['ARBEITNOW_SNAPSHOT_PATH'] = os.path.join(work_dir, 'arbeitnow_snapshot.json')
+        from job_api import JobAPI
+
+        api = JobAPI()
+        # The old flat 10 s timeout, so the sequential run waits the way search_jobs used to
+        api.timeout = 10
+        start = time.perf_counter()
+        sequential = []
+        for search in (lambda: api._search_adzuna(args.title, ''), lambda: api._search_jsearch(args.title, ''),
+                       lambda: api._search_remotive(args.title), lambda: api._fetch_arbeitnow_board()):
+            try:
+                sequential.extend(search())
+            except Exception as e:
+                print(f"sequential provider error: {e}")
+        print(f"sequential  {time.perf_counter() - start:6.2f}s  {len(sequential[:20])} jobs")
+
+        api.timeout = min(10, args.deadline)
+        start = time.perf_counter()
+        result = api.search_jobs_detailed(args.title)
+        print(f"concurrent  {time.perf_counter() - start:6.2f}s  {len(result['jobs'])} jobs")
+        for name, status in result['providers'].items():
+            print(f"  {name:<10} {status['status']:<8} {status['count']:>3} jobs  {status['latency_ms']:>6} ms"
+                  f"{'  ' + status['error'] if status.get('error') else ''}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Live provider fan-out against the ingested local job store.
+
+    python benchmarks/bench_job_store.py --latency adzuna=0.3 jsearch=0.5 remotive=1 arbeitnow=0.8
+
+Runs one job_ingest pass against the stub providers, then answers the same
+searches from JobStore (FTS5, BM25-ranked, paginated) and, for comparison,
+live with search_jobs_detailed and an empty provider cache.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_job_providers import StubJobProviders, _pairs
+
+QUERIES = ['Python Developer', 'data engineer', 'Machine Learning Engineer', 'devops', 'product manager']
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--latency', nargs='*', default=['adzuna=0.3', 'jsearch=0.5', 'remotive=1', 'arbeitnow=0.8'],
+                            help="provider=seconds")
+    arg_parser.add_argument('--board-size', type=int, default=2000, help="Arbeitnow postings")
+    arg_parser.add_argument('--searches', type=int, default=500)
+    args = arg_parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    with StubJobProviders(_pairs(args.latency, float), count={'arbeitnow': args.board_size}) as stubs:
+        os.environ.update(stubs.environ())
+        os.environ['JOB_CACHE_PATH'] = os.path.join(work_dir, 'job_search.db')
+        os.environ['ARBEITNOW_SNAPSHOT_PATH'] = os.path.join(work_dir, 'arbeitnow_snapshot.json')
+        from job_api import JobAPI
+        from job_ingest import ingest_once
+        from job_store import JobStore
+
+        store = JobStore(os.path.join(work_dir, 'job_store.db'))
+        summary = ingest_once(JobAPI(), store, QUERIES, [''])
+        print(f"ingest pass: {summary}")
+
+        timings = []
+        for i in range(args.searches):
+            start = time.perf_counter()
+            result = store.search(QUERIES[i % len(QUERIES)], page=1 + i % 3, per_page=20)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"store       p50 {statistics.median(timings) * 1000:7.2f} ms   "
+              f"p99 {timings[int(len(timings) * 0.99) - 1] * 1000:7.2f} ms   "
+              f"'{QUERIES[-1]}': {result['total']} matches")
+
+        timings = []
+        # Queries the ingest never made, so nothing is cached
+        for query in QUERIES:
+            api = JobAPI()
+            start = time.perf_counter()
+            api.search_jobs_detailed(query + ' live', limit=None)
+            timings.append(time.perf_counter() - start)
+        print(f"live        p50 {statistics.median(timings) * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
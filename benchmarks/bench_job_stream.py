@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Time to first result of /search_jobs against /search_jobs/stream, with stub providers.
+
+    python benchmarks/bench_job_stream.py --latency adzuna=0.3 jsearch=0.8 remotive=1.5 arbeitnow=0.5
+
+Each search adds a new word to the title, so neither the provider cache nor the job
+store can answer it and every request waits on the providers.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_job_providers import StubJobProviders, _pairs
+
+
+def timed_search(client, path, title):
+    """(seconds to the first job, seconds to the whole response, jobs received)"""
+    start = time.perf_counter()
+    response = client.post(path, json={'job_title': title}, buffered=False)
+    first_result = None
+    jobs = 0
+    buffer = b''
+    for chunk in response.response:
+        buffer += chunk
+        if not path.endswith('/stream'):
+            continue
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            count = len(json.loads(line).get('jobs') or [])
+            if count and first_result is None:
+                first_result = time.perf_counter() - start
+            jobs += count
+    total = time.perf_counter() - start
+    response.close()
+    if not path.endswith('/stream'):
+        first_result = total
+        jobs = len(json.loads(buffer)['jobs'])
+    return first_result, total, jobs
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--latency', nargs='*', default=['adzuna=0.3', 'jsearch=0.8', 'remotive=1.5', 'arbeitnow=0.5'],
+                            help="provider=seconds")
+    arg_parser.add_argument('--runs', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    with StubJobProviders(_pairs(args.latency, float)) as stubs:
+        os.environ.update(stubs.environ())
+        os.environ.setdefault('GROQ_API_KEY', 'stub')
+        for name, file_name in (('JOB_CACHE_PATH', 'job_search.db'), ('JOB_STORE_PATH', 'job_store.db'),
+                                ('JOB_INDEX_PATH', 'job_index.db'), ('JOB_STREAM_CURSOR_PATH', 'search_results.db'),
+                                ('ARBEITNOW_SNAPSHOT_PATH', 'arbeitnow_snapshot.json')):
+            os.environ[name] = os.path.join(work_dir, file_name)
+        from app_flask import app, job_api
+
+        client = app.test_client()
+        # Download the Arbeitnow board and load the job index before timing anything
+        job_api.arbeitnow_snapshot.jobs()
+        client.post('/search_jobs', json={'job_title': 'warm up'})
+
+        print(f"{'endpoint':<22}{'first result':>14}{'complete':>12}{'jobs':>7}")
+        for run in range(args.runs):
+            for path in ('/search_jobs', '/search_jobs/stream'):
+                first_result, total, jobs = timed_search(client, path, f"Python Developer {uuid.uuid4().hex[:8]}")
+                print(f"{path:<22}{first_result:>13.2f}s{total:>11.2f}s{jobs:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Latency and token usage of get_line_improvements per mode, against the stub LLM server.
+
+    python benchmarks/bench_line_improvements.py --latency 0.5 --lines 20
+
+'sequential' is the old one-call-per-line loop (the concurrent path with a
+single worker); 'concurrent' uses LINE_IMPROVEMENT_WORKERS threads and
+'batch' sends every line in one prompt.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_llm_server import StubLLMServer
+
+
+def sample_resume(lines):
+    bullets = [
+        "Developed REST APIs in Python and Flask serving internal analytics dashboards",
+        "Managed a team of four engineers delivering quarterly platform releases",
+        "Responsible for database maintenance and query tuning on PostgreSQL",
+        "Worked with product owners to gather requirements for new features",
+        "Implemented CI/CD pipelines with GitHub Actions and Docker images",
+    ]
+    return '\n'.join(bullets[i % len(bullets)] for i in range(lines))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--latency', type=float, default=0.5, help="Stub LLM first-token latency, seconds")
+    arg_parser.add_argument('--token-latency', type=float, default=0.002, help="Stub LLM seconds per generated word")
+    arg_parser.add_argument('--lines', type=int, default=20)
+    arg_parser.add_argument('--deadline', type=float, default=30.0)
+    args = arg_parser.parse_args()
+
+    with StubLLMServer(latency=args.latency, token_latency=args.token_latency) as server:
+        os.environ['GROQ_BASE_URL'] = server.url
+        os.environ.setdefault('GROQ_API_KEY', 'stub')
+        # The stub has no rate limit; keep the gateway's limiter out of the measurement
+        os.environ.setdefault('LLM_REQUESTS_PER_MINUTE', '100000')
+        os.environ.setdefault('LLM_TOKENS_PER_MINUTE', '100000000')
+        # Every mode must reach the model for the comparison to mean anything
+        os.environ['LLM_CACHE_ENABLED'] = 'false'
+        from ats_analyzer import ATSAnalyzer
+
+        analyzer = ATSAnalyzer()
+        workers = os.getenv('LINE_IMPROVEMENT_WORKERS', '5')
+        resume = sample_resume(args.lines)
+        print(f"{'mode':<12}{'seconds':>9}{'calls':>7}{'prompt tok':>12}{'completion tok':>16}{'lines':>7}")
+        for mode in ('sequential', 'concurrent', 'batch'):
+            # A one-thread pool for the sequential row, the configured one afterwards
+            os.environ['LINE_IMPROVEMENT_WORKERS'] = '1' if mode == 'sequential' else workers
+            server.reset_stats()
+            start = time.perf_counter()
+            improvements = analyzer.get_line_improvements(
+                resume, mode='batch' if mode == 'batch' else 'concurrent', deadline=args.deadline
+            )
+            elapsed = time.perf_counter() - start
+            stats = server.stats
+            print(f"{mode:<12}{elapsed:>9.2f}{stats['requests']:>7}{stats['prompt_tokens']:>12}"
+                  f"{stats['completion_tokens']:>16}{len(improvements):>7}")
+            # Calls already in flight at the deadline still finish; keep them out of the next row
+            time.sleep(args.latency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Exercise LLMGateway against the stub LLM server: rate limiting, priorities,
+retries on injected 429s and connection reuse.
+
+    python benchmarks/bench_llm_gateway.py --batch 20 --interactive 5 --rpm 120 --error-rate 0.2
+
+Batch calls are queued first; interactive calls submitted a moment later
+should still finish well ahead of most of the batch work.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_llm_server import StubLLMServer
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--batch', type=int, default=20)
+    arg_parser.add_argument('--interactive', type=int, default=5)
+    arg_parser.add_argument('--rpm', type=float, default=120, help="Gateway request budget per minute")
+    arg_parser.add_argument('--tpm', type=float, default=200000, help="Gateway token budget per minute")
+    arg_parser.add_argument('--latency', type=float, default=0.1)
+    arg_parser.add_argument('--error-rate', type=float, default=0.2)
+    args = arg_parser.parse_args()
+
+    with StubLLMServer(latency=args.latency, token_latency=0.0, error_rate=args.error_rate) as server:
+        from llm_gateway import LLMGateway
+
+        gateway = LLMGateway(api_key='stub', base_url=server.url, requests_per_minute=args.rpm,
+                             tokens_per_minute=args.tpm, max_retries=5)
+        # Start with an empty request bucket so both priorities compete for the same refills
+        gateway.requests.level = 0
+        finished = {'interactive': [], 'batch': []}
+        failures = []
+        lock = threading.Lock()
+        start = time.perf_counter()
+
+        def call(i, priority):
+            try:
+                gateway.complete([{'role': 'user', 'content': f"{priority} request {i}"}], 'stub-model',
+                                 priority=priority, max_tokens=50)
+            except Exception as e:
+                with lock:
+                    failures.append(f"{priority} {i}: {e}")
+                return
+            with lock:
+                finished[priority].append(time.perf_counter() - start)
+
+        threads = [threading.Thread(target=call, args=(i, 'batch')) for i in range(args.batch)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        interactive = [threading.Thread(target=call, args=(i, 'interactive')) for i in range(args.interactive)]
+        for thread in interactive:
+            thread.start()
+        for thread in threads + interactive:
+            thread.join()
+
+        for priority, times in finished.items():
+            if times:
+                print(f"{priority:<12} n={len(times):<4} median {statistics.median(times):6.2f}s  "
+                      f"max {max(times):6.2f}s")
+        stats = gateway.stats()
+        print(f"gateway: calls={stats['calls']} retries={stats['retries']} failures={stats['failures']} "
+              f"throttled={stats['throttled_seconds']}s")
+        print(f"stub: requests={server.stats['requests']} injected errors={server.stats['errors']} "
+              f"tcp connections={server.stats['connections']}")
+        for failure in failures:
+            print(f"failed: {failure}")
+        gateway.close()
+
+
+if __name__ == '__main__':
+    main()
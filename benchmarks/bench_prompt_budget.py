@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Compare fixed character slices with prompt_budget.compress on resume/job pairs.
+
+    python benchmarks/bench_prompt_budget.py [resume.txt job.txt]
+
+For each excerpt it reports the estimated input tokens and how many of the
+job description's keywords found anywhere in the resume survive into the
+resume excerpt - the part of the resume the model actually gets to see.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_analyzer import extract_keywords
+from prompt_budget import compress, estimate_tokens
+
+RESUME = """Jane Doe
+Senior Software Engineer | jane.doe@example.com | +1 555 123 4567 | linkedin.com/in/janedoe
+Portfolio: https://janedoe.dev | GitHub: https://github.com/janedoe | Open to relocation
+
+SUMMARY
+Dependable, detail-oriented professional with a passion for technology, teamwork and continuous learning.
+Excellent communication skills, strong work ethic and a positive attitude in fast-paced environments.
+Hobbies include hiking, photography, chess, cooking and volunteering at the local animal shelter.
+
+EXPERIENCE
+Acme Retail - Store Associate (2012 - 2014)
+Greeted customers, handled the cash register and restocked shelves during peak holiday seasons.
+Trained new seasonal staff on store policies and customer service standards.
+
+Globex - Software Engineer (2016 - 2019)
+Built internal reporting tools in PHP and jQuery for the finance department.
+Maintained legacy Perl scripts for nightly batch jobs.
+
+Initech - Senior Backend Engineer (2019 - present)
+Designed Python microservices on Kubernetes handling 40k requests per second with p99 under 80 ms.
+Led migration from a monolith to event-driven services using Kafka and PostgreSQL, cutting costs 35%.
+Built CI/CD pipelines with Terraform and GitHub Actions deploying to AWS EKS twenty times a day.
+Mentored five engineers and introduced observability with Prometheus and Grafana.
+
+SKILLS
+Python, Go, Kafka, PostgreSQL, Redis, Kubernetes, Terraform, AWS, Docker, Prometheus, Grafana
+
+EDUCATION
+BSc Computer Science, State University, 2016
+"""
+
+JOB = """About us
+We are a fast-growing fintech company on a mission to make payments simple. We value diversity,
+ownership and curiosity. Our offices are pet friendly and we offer free lunches on Fridays.
+
+The role
+We are hiring a Senior Backend Engineer to build the Python and Go services behind our payment platform.
+
+Requirements
+5+ years building backend services in Python or Go
+Production experience with Kafka, PostgreSQL and Redis
+Kubernetes on AWS (EKS), infrastructure as code with Terraform
+Observability with Prometheus and Grafana
+
+Benefits
+Competitive salary, equity, 30 days holiday, learning budget and a home office allowance.
+We are an equal opportunity employer and welcome applicants from all backgrounds.
+"""
+
+
+def report(label, resume_excerpt, job_excerpt, relevant):
+    kept = relevant & set(extract_keywords(resume_excerpt))
+    tokens = estimate_tokens(resume_excerpt) + estimate_tokens(job_excerpt)
+    print(f"{label:<34}{tokens:>8}{len(kept):>6}/{len(relevant)}")
+
+
+def main():
+    resume, job = RESUME, JOB
+    if len(sys.argv) == 3:
+        with open(sys.argv[1], encoding='utf-8') as f:
+            resume = f.read()
+        with open(sys.argv[2], encoding='utf-8') as f:
+            job = f.read()
+
+    # Job keywords the candidate has somewhere in the resume
+    relevant = set(extract_keywords(job)) & set(extract_keywords(resume))
+    print(f"{'excerpt':<34}{'tokens':>8}{'kept keywords':>14}")
+    report('full text', resume, job, relevant)
+    for chars, budget in ((1500, 350), (1000, 250), (600, 150)):
+        report(f"slice [:{chars}]", resume[:chars], job[:chars], relevant)
+        start = time.perf_counter()
+        resume_excerpt = compress(resume, job, budget_tokens=budget)
+        job_excerpt = compress(job, resume, budget_tokens=budget)
+        elapsed = (time.perf_counter() - start) * 1000
+        report(f"compress {budget} tok ({elapsed:.0f} ms)", resume_excerpt, job_excerpt, relevant)
+
+
+if __name__ == '__main__':
+    main()
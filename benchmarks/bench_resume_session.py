@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Resume text in the signed session cookie against ResumeSessionStore.
+
+    python benchmarks/bench_resume_session.py [resume.txt]
+
+Reports the Set-Cookie size each way, the per-request cost of loading the
+resume (verifying and decoding the cookie, or reading the store), and the
+resume-side cost of a /match_job with and without the cached features.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_prompt_budget import RESUME
+
+
+def per_call_ms(function, runs=500):
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) * 1000 / runs
+
+
+def main():
+    resume = RESUME
+    if len(sys.argv) == 2:
+        with open(sys.argv[1], encoding='utf-8') as f:
+            resume = f.read()
+    os.environ.setdefault('GROQ_API_KEY', 'stub')
+    os.environ['RESUME_SESSION_PATH'] = os.path.join(tempfile.mkdtemp(), 'resume_sessions.db')
+    from app_flask import analyzer, app, get_resume_sessions
+
+    serializer = app.session_interface.get_signing_serializer(app)
+    store = get_resume_sessions()
+    resume_id = store.create(resume, features=analyzer.resume_features(resume))
+    old_cookie = serializer.dumps({'resume_text': resume})
+    new_cookie = serializer.dumps({'resume_id': resume_id})
+
+    print(f"resume {len(resume)} characters")
+    print(f"{'':<26}{'cookie':>10}{'load ms':>10}")
+    print(f"{'text in cookie':<26}{len(old_cookie):>10}{per_call_ms(lambda: serializer.loads(old_cookie)):>10.3f}")
+    print(f"{'id in cookie, store (mem)':<26}{len(new_cookie):>10}"
+          f"{per_call_ms(lambda: store.get(serializer.loads(new_cookie)['resume_id'])):>10.3f}")
+    store.cache.memory.clear()
+    print(f"{'id in cookie, store (disk)':<26}{len(new_cookie):>10}"
+          f"{per_call_ms(lambda: (store.cache.memory.clear(), store.get(resume_id)), runs=200):>10.3f}")
+    if len(old_cookie) > 4093:
+        print("  the text cookie is over the 4 KB browser limit and would be dropped")
+
+    print(f"\nresume features per /match_job: computed {per_call_ms(lambda: analyzer.resume_features(resume), 50):.3f} ms, "
+          f"cached {per_call_ms(lambda: store.get(resume_id)['artifacts']['features']):.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
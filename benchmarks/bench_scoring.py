@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Throughput of ATSAnalyzer.analyze_resume / analyze_resumes against the original scorer.
+
+    python benchmarks/bench_scoring.py [--docs 2000]
+
+The original implementation is reproduced below and timed as it was, with
+substring keyword checks. Since the KeywordMatcher, keyword hits are whole
+words, so results are compared against the same code with whole-word
+checks; the script fails if any score or feedback differs.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_analyzer import ATSAnalyzer  # noqa: E402
+
+WORDS = ('managed developed implemented created improved increased reduced led collaborated '
+         'python sql aws team project platform customers revenue pipeline latency service '
+         'experience education skills work employment responsibilities achievements').split()
+
+
+def legacy_analyze(analyzer, text, whole_words=False):
+    """analyze_resume as it was before the scoring engine"""
+    score = 0
+    feedback = []
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+    if bool(re.search(email_pattern, text)) and bool(re.search(phone_pattern, text)):
+        score += 10
+    else:
+        feedback.append("Add clear contact information (email, phone)")
+    sections = ['experience', 'education', 'skills', 'work', 'employment']
+    if sum(1 for section in sections if section in text.lower()) >= 2:
+        score += 10
+    else:
+        feedback.append("Include standard sections: Experience, Education, Skills")
+    number_pattern = r'\d+%|\d+\+|\$\d+|\d+k|\d+ years?|\d+ months?'
+    if len(re.findall(number_pattern, text, re.IGNORECASE)) >= 3:
+        score += 10
+    else:
+        feedback.append("Add quantified achievements (numbers, percentages)")
+    text_lower = text.lower()
+    if whole_words:
+        found_keywords = sum(1 for keyword in analyzer.ats_keywords
+                             if re.search(rf'\b{re.escape(keyword)}\b', text_lower))
+    else:
+        found_keywords = sum(1 for keyword in analyzer.ats_keywords if keyword in text_lower)
+    keyword_score = min(int((found_keywords / len(analyzer.ats_keywords)) * 40), 40)
+    score += keyword_score
+    if keyword_score < (40 * 0.75):
+        feedback.append("Include more action verbs and industry keywords")
+    format_score = 30
+    if len(text) < 200:
+        format_score -= 10
+    if text.count('\n') < 5:
+        format_score -= 10
+    if not re.search(r'[•\-\*]', text):
+        format_score -= 10
+    format_score = max(format_score, 0)
+    score += format_score
+    if format_score < 20:
+        feedback.append("Improve formatting: use bullet points, consistent spacing")
+    if not feedback:
+        feedback.append("Great job! Your resume is ATS-friendly")
+    return min(score, 100), feedback
+
+
+def synthetic_resume(rng):
+    lines = []
+    if rng.random() < 0.7:
+        lines.append(f"jane.doe{rng.randint(1, 999)}@example.com | (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}")
+    for _ in range(rng.randint(5, 120)):
+        words = rng.choices(WORDS, k=rng.randint(4, 16))
+        if rng.random() < 0.3:
+            words.append(rng.choice([f"{rng.randint(1, 99)}%", f"${rng.randint(1, 900)}k", f"{rng.randint(1, 12)} years"]))
+        bullet = rng.choice(['• ', '- ', '* ', ''])
+        lines.append(bullet + ' '.join(words))
+    return '\n'.join(lines)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--docs', type=int, default=2000)
+    arg_parser.add_argument('--seed', type=int, default=7)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [synthetic_resume(rng) for _ in range(args.docs)]
+    analyzer = ATSAnalyzer(groq_api_key=os.getenv('GROQ_API_KEY') or 'benchmark')
+
+    started = time.perf_counter()
+    legacy = [legacy_analyze(analyzer, text) for text in texts]
+    legacy_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    single = [analyzer.analyze_resume(text) for text in texts]
+    single_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = analyzer.analyze_resumes(texts)
+    batch_s = time.perf_counter() - started
+
+    reference = [legacy_analyze(analyzer, text, whole_words=True) for text in texts]
+    mismatches = sum(1 for old, new in zip(reference, batch) if old != new)
+    mismatches += sum(1 for old, new in zip(reference, single) if old != new)
+    for name, elapsed in (('legacy', legacy_s), ('analyze_resume', single_s), ('analyze_resumes', batch_s)):
+        print(f"{name:16s} {args.docs / elapsed:10.0f} docs/s  ({elapsed * 1000:.1f} ms)")
+    print(f"speedup          {legacy_s / single_s:10.2f}x analyze_resume, {legacy_s / batch_s:.2f}x analyze_resumes")
+    if mismatches:
+        print(f"{mismatches} results differ from the legacy scorer")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
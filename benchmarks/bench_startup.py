@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Cold-start cost of the Flask app: import time and first-request latency.
+
+    python benchmarks/bench_startup.py [--runs 3]
+
+Each run starts a fresh interpreter, imports app_flask, then times the
+first /upload (resume scoring) and the first /rank_jobs (TF-IDF model
+load, no LLM call). GROQ_API_KEY is set to a placeholder so the app can
+start without credentials.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import io, json, sys, time
+started = time.perf_counter()
+import app_flask
+imported = time.perf_counter()
+client = app_flask.app.test_client()
+resume = b"Jane Doe\njane@example.com (555) 123-4567\nExperience\n- Managed a team of 5, increased revenue 20%\n" * 5
+t0 = time.perf_counter()
+client.post('/upload', data={'resume': (io.BytesIO(resume), 'resume.txt')}, content_type='multipart/form-data')
+t1 = time.perf_counter()
+client.post('/rank_jobs', json={'job_descriptions': ['Engineering manager with experience leading teams and growing revenue.']})
+t2 = time.perf_counter()
+heavy = sorted(m for m in ('sklearn', 'numpy', 'scipy') if m in sys.modules)
+print(json.dumps({'import_ms': (imported - started) * 1000, 'first_upload_ms': (t1 - t0) * 1000,
+                  'first_rank_jobs_ms': (t2 - t1) * 1000, 'heavy_modules': heavy}))
+"""
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--runs', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    env = dict(os.environ, GROQ_API_KEY=os.getenv('GROQ_API_KEY') or 'benchmark', PYTHONPATH=ROOT)
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    for key in ('import_ms', 'first_upload_ms', 'first_rank_jobs_ms'):
+        values = [r[key] for r in results]
+        print(f"{key:20s} median {statistics.median(values):8.1f} ms   min {min(values):8.1f} ms")
+    print(f"{'heavy modules':20s} {', '.join(results[-1]['heavy_modules']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
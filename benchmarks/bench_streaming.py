@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Time to first byte and total time of /enhance_resume and /generate_cover_letter,
+JSON versus Server-Sent Events, against the stub LLM server.
+
+    python benchmarks/bench_streaming.py --latency 0.4 --token-latency 0.02
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_llm_server import StubLLMServer
+
+RESUME = """Jane Doe
+jane@example.com | 555-123-4567
+Experience
+Developed REST APIs in Python and Flask serving internal analytics dashboards
+Managed a team of four engineers delivering quarterly platform releases
+Education
+BSc Computer Science"""
+
+
+def timed_request(client, path, payload, stream):
+    headers = {'Accept': 'text/event-stream'} if stream else {}
+    start = time.perf_counter()
+    response = client.post(path, json=payload, headers=headers, buffered=False)
+    first_byte = None
+    size = 0
+    for chunk in response.response:
+        if chunk and first_byte is None:
+            first_byte = time.perf_counter() - start
+        size += len(chunk)
+    response.close()
+    return first_byte, time.perf_counter() - start, size
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--latency', type=float, default=0.4, help="Stub LLM first-token latency, seconds")
+    arg_parser.add_argument('--token-latency', type=float, default=0.02)
+    args = arg_parser.parse_args()
+
+    with StubLLMServer(latency=args.latency, token_latency=args.token_latency) as server:
+        os.environ['GROQ_BASE_URL'] = server.url
+        os.environ.setdefault('GROQ_API_KEY', 'stub')
+        # The stub has no rate limit; keep the gateway's limiter out of the measurement
+        os.environ.setdefault('LLM_REQUESTS_PER_MINUTE', '100000')
+        os.environ.setdefault('LLM_TOKENS_PER_MINUTE', '100000000')
+        # Every request must reach the model for the comparison to mean anything
+        os.environ['LLM_CACHE_ENABLED'] = 'false'
+        from app_flask import app, get_resume_sessions
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['resume_id'] = get_resume_sessions().create(RESUME)
+
+        requests = [
+            ('/enhance_resume', {'target_score': 90}),
+            ('/generate_cover_letter', {'company_name': 'Acme', 'position': 'Backend Engineer',
+                                        'job_description': 'Python, Flask, PostgreSQL, AWS'}),
+        ]
+        print(f"{'endpoint':<24}{'mode':<8}{'first byte':>12}{'total':>9}{'bytes':>8}")
+        for path, payload in requests:
+            for stream in (False, True):
+                first_byte, total, size = timed_request(client, path, payload, stream)
+                print(f"{path:<24}{'sse' if stream else 'json':<8}{first_byte:>11.3f}s{total:>8.3f}s{size:>8}")
+
+
+if __name__ == '__main__':
+    main()
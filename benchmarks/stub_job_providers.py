@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Local stand-ins for the Adzuna, JSearch, Remotive and Arbeitnow APIs.
+
+    python benchmarks/stub_job_providers.py --latency remotive=3 --status jsearch=500
+
+prints the *_BASE_URL variables to export before starting the app. From
+Python:
+
+    with StubJobProviders(latency={'remotive': 3.0}) as stubs:
+        os.environ.update(stubs.environ())
+
+Each provider runs its own HTTP server (so each is a separate host:port,
+like the real APIs) and answers in that provider's JSON format after its
+configured latency, or with its configured error status.
+"""
+import argparse
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PROVIDERS = ('adzuna', 'jsearch', 'remotive', 'arbeitnow')
+TITLES = ('Python Developer', 'Senior Python Developer', 'Data Engineer', 'Backend Engineer',
+          'Frontend Developer', 'DevOps Engineer', 'Machine Learning Engineer', 'Product Manager')
+
+
+def _postings(provider, query, count):
+    query = (query or 'Python Developer').strip()
+    for i in range(count):
+        title = f"{query} {i}" if provider != 'arbeitnow' else TITLES[i % len(TITLES)]
+        description = (f"<p>{title} at {provider.title()} Co {i}. Python, Flask, PostgreSQL, AWS, Docker "
+                       f"and Kubernetes experience wanted. " + "Lorem ipsum dolor sit amet. " * 20 + "</p>")
+        yield i, title, description
+
+
+def provider_payload(provider, query, count):
+    if provider == 'adzuna':
+        return {'results': [{'title': title, 'company': {'display_name': f"Adzuna Co {i}"},
+                             'location': {'display_name': 'Remote'}, 'salary_min': 90000, 'salary_max': 120000,
+                             'description': description, 'redirect_url': f"https://adzuna.example/{i}"}
+                            for i, title, description in _postings(provider, query, count)]}
+    if provider == 'jsearch':
+        return {'data': [{'job_title': title, 'employer_name': f"JSearch Co {i}", 'job_city': 'Austin',
+                          'job_state': 'TX', 'job_description': description,
+                          'job_apply_link': f"https://jsearch.example/{i}"}
+                         for i, title, description in _postings(provider, query, count)]}
+    if provider == 'remotive':
+        return {'jobs': [{'title': title, 'company_name': f"Remotive Co {i}",
+                          'candidate_required_location': 'Worldwide', 'description': description,
+                          'url': f"https://remotive.example/{i}"}
+                         for i, title, description in _postings(provider, query, count)]}
+    # Arbeitnow returns its whole board regardless of the query
+    return {'data': [{'title': title, 'company_name': f"Arbeitnow Co {i}", 'location': 'Berlin',
+                      'description': description, 'url': f"https://arbeitnow.example/{i}",
+                      'slug': f"arbeitnow-{i}"}
+                     for i, title, description in _postings(provider, query, count)]}
+
+
+class StubJobProvider:
+    def __init__(self, name, latency=0.1, status=200, count=None, handshake=0.0, host='127.0.0.1', port=0):
+        self.name = name
+        self.latency = latency
+        # Extra delay before a new connection's first response, standing in for a TLS handshake
+        self.handshake = handshake
+        self.status = status
+        self.count = count if count is not None else (200 if name == 'arbeitnow' else 10)
+        self.stats = {'connections': 0, 'requests': 0, 'bytes_sent': 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out as separate writes; without this a kept-alive
+            # connection stalls on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with provider._lock:
+                    provider.stats['connections'] += 1
+                time.sleep(provider.handshake)
+
+            def do_GET(self):
+                with provider._lock:
+                    provider.stats['requests'] += 1
+                time.sleep(provider.latency)
+                if provider.status != 200:
+                    payload = {'error': 'stub failure'}
+                else:
+                    params = parse_qs(urlparse(self.path).query)
+                    query = (params.get('what') or params.get('query') or params.get('search') or [''])[0]
+                    payload = provider_payload(provider.name, query, provider.count)
+                data = json.dumps(payload).encode('utf-8')
+                gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+                if gzipped:
+                    data = gzip.compress(data, compresslevel=5)
+                with provider._lock:
+                    provider.stats['bytes_sent'] += len(data)
+                self.send_response(provider.status)
+                self.send_header('Content-Type', 'application/json')
+                if gzipped:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {key: 0 for key in self.stats}
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class StubJobProviders:
+    """All four providers, each on its own port"""
+
+    def __init__(self, latency=None, status=None, count=None, handshake=0.0):
+        latency, status, count = latency or {}, status or {}, count or {}
+        self.providers = {name: StubJobProvider(name, latency.get(name, 0.1), status.get(name, 200), count.get(name),
+                                                handshake)
+                          for name in PROVIDERS}
+
+    def environ(self):
+        env = {f"{name.upper()}_BASE_URL": provider.url for name, provider in self.providers.items()}
+        env['RAPIDAPI_KEY'] = 'stub'
+        return env
+
+    def __enter__(self):
+        for provider in self.providers.values():
+            provider.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        for provider in self.providers.values():
+            provider.stop()
+
+
+def _pairs(values, cast):
+    return {name: cast(value) for name, value in (item.split('=', 1) for item in values)}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--latency', nargs='*', default=[], help="provider=seconds")
+    arg_parser.add_argument('--status', nargs='*', default=[], help="provider=http status")
+    args = arg_parser.parse_args()
+
+    stubs = StubJobProviders(_pairs(args.latency, float), _pairs(args.status, int))
+    with stubs:
+        for name, value in stubs.environ().items():
+            print(f"export {name}={value}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Local OpenAI/Groq-compatible chat completions server for benchmarks.
+
+    python benchmarks/stub_llm_server.py --port 8099 --latency 0.5
+    GROQ_BASE_URL=http://127.0.0.1:8099 python app_flask.py
+
+Or programmatically:
+
+    with StubLLMServer(latency=0.5) as server:
+        os.environ['GROQ_BASE_URL'] = server.url
+        ...
+        print(server.stats)
+
+Every request ending in /chat/completions sleeps for ``latency`` seconds
+and answers with a canned completion plus OpenAI-style usage counts. For
+prompts listing several 'Line N: "..."' entries it answers one
+'N: suggestion' line per entry, like a well-behaved model would. Words
+are "generated" every ``token_latency`` seconds: with "stream": true
+each one is sent as a server-sent chunk as it is produced, otherwise the
+response goes out after the last one. A fraction ``error_rate`` of the
+requests is answered with ``error_status`` instead (429 comes with a
+Retry-After header), to exercise retries.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LINE_PATTERN = re.compile(r'^Line (\d+):', re.MULTILINE)
+REPLY = ("Suggestion: Lead with a strong action verb, name the tools you used and quantify "
+         "the result with a concrete metric such as revenue, time saved or users served.")
+
+
+def count_tokens(text):
+    # Roughly four characters per token, like OpenAI's rule of thumb
+    return max(1, len(text) // 4)
+
+
+class StubLLMServer:
+    def __init__(self, host='127.0.0.1', port=0, latency=0.2, token_latency=0.02,
+                 error_rate=0.0, error_status=429, retry_after=0.2, seed=0):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self.stats = {'connections': 0, 'requests': 0, 'errors': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def inject_error(self):
+        with self._lock:
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return True
+        return False
+
+    def completion(self, body):
+        prompt = '\n'.join(message.get('content', '') for message in body.get('messages', []))
+        line_numbers = LINE_PATTERN.findall(prompt)
+        if len(line_numbers) > 1:
+            content = '\n'.join(f"{number}: {REPLY[len('Suggestion: '):]}" for number in line_numbers)
+        else:
+            content = REPLY
+        usage = {'prompt_tokens': count_tokens(prompt), 'completion_tokens': count_tokens(content)}
+        usage['total_tokens'] = usage['prompt_tokens'] + usage['completion_tokens']
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['prompt_tokens'] += usage['prompt_tokens']
+            self.stats['completion_tokens'] += usage['completion_tokens']
+        return content, usage
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                # One handler per TCP connection: counts how well clients reuse connections
+                super().setup()
+                with server._lock:
+                    server.stats['connections'] += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if not self.path.endswith('/chat/completions'):
+                    self._send(404, {'error': {'message': 'not found'}})
+                    return
+                if server.inject_error():
+                    headers = {'Retry-After': str(server.retry_after)} if server.error_status == 429 else {}
+                    self._send(server.error_status, {'error': {'message': 'stub error', 'type': 'stub'}}, headers)
+                    return
+                content, usage = server.completion(body)
+                time.sleep(server.latency)
+                if body.get('stream'):
+                    self._stream(body, content)
+                    return
+                # A non-streamed answer only arrives once every token is generated
+                time.sleep(server.token_latency * (len(content.split()) - 1))
+                self._send(200, {
+                    'id': 'chatcmpl-stub',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': body.get('model', 'stub'),
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': content}}],
+                    'usage': usage,
+                })
+
+            def _stream(self, body, content):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                words = re.findall(r'\S+\s*', content)
+                for i, word in enumerate(words):
+                    if i:
+                        time.sleep(server.token_latency)
+                    chunk = {
+                        'id': 'chatcmpl-stub',
+                        'object': 'chat.completion.chunk',
+                        'created': int(time.time()),
+                        'model': body.get('model', 'stub'),
+                        'choices': [{'index': 0, 'delta': {'content': word},
+                                     'finish_reason': 'stop' if i == len(words) - 1 else None}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8099)
+    arg_parser.add_argument('--latency', type=float, default=0.2, help="Seconds before the first token")
+    arg_parser.add_argument('--token-latency', type=float, default=0.02, help="Seconds between streamed words")
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests that fail")
+    arg_parser.add_argument('--error-status', type=int, default=429)
+    args = arg_parser.parse_args()
+
+    server = StubLLMServer(args.host, args.port, args.latency, args.token_latency,
+                           error_rate=args.error_rate, error_status=args.error_status)
+    print(f"Stub LLM server listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
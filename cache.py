@@ -0,0 +1,381 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache bounded by the total size of its values,
+    with an optional time-to-live per entry"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, sizeof=len, ttl=None):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, size, expires_at)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                del self._data[key]
+                self._size -= entry[1]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._data[key] = (value, size, expires_at)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self._size -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            'entries': len(self._data),
+            'bytes': self._size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class DiskCache:
+    """Directory-backed byte cache shared by every process on the host.
+
+    Entries are written atomically (temp file + rename), reads refresh the
+    file's mtime, and the least recently used files are removed once the
+    directory grows past ``max_bytes``. With a ``ttl`` the mtime records the
+    write time instead, and entries older than ``ttl`` seconds are misses.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, evict_every=50, ttl=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.ttl = ttl
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                if self.ttl is not None and time.time() - os.fstat(f.fileno()).st_mtime > self.ttl:
+                    raise FileNotFoundError(path)
+                data = f.read()
+            if self.ttl is None:
+                os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def set(self, key, data):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Disk cache write error: {e}")
+            return
+
+        with self._lock:
+            self._writes += 1
+            should_evict = self._writes % self.evict_every == 1
+        if should_evict:
+            self.evict()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield st.st_mtime, st.st_size, path
+
+    def evict(self):
+        """Remove least recently used entries until the directory is back under 90% of max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return total
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        return total
+
+    def stats(self):
+        return {
+            'directory': self.directory,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class SQLiteCache:
+    """Byte cache in a single SQLite file, shared by every process on the host.
+
+    Entries carry their own expiry time; the least recently read entries are
+    deleted once the stored values grow past ``max_bytes``.
+    """
+
+    _connect_lock = threading.Lock()
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, evict_every=50, ttl=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.ttl = ttl
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        self._pid = None
+        self._inherited = []
+
+    def _connect(self):
+        """This process's connection, opened on first use.
+
+        A SQLite connection must not be used across fork (gunicorn preloads
+        the app in the master, then forks the workers), so a child that
+        inherited one opens its own.
+        """
+        if self._pid == os.getpid():
+            return self._db
+        with SQLiteCache._connect_lock:
+            if self._pid == os.getpid():
+                return self._db
+            return self._open()
+
+    def _open(self):
+        if self._db is not None:
+            # Closing the parent's connection from the child could disturb its locks; just stop using it
+            self._inherited.append(self._db)
+            self._lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL,
+                expires_at REAL
+            )
+        """)
+        db.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)')
+        db.commit()
+        self._db, self._pid = db, os.getpid()
+        return db
+
+    def get(self, key):
+        now = time.time()
+        try:
+            db = self._connect()
+            with self._lock:
+                row = db.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None and (row[1] is None or row[1] > now):
+                    with db:
+                        db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            print(f"SQLite cache read error: {e}")
+            row = None
+        if row is None or (row[1] is not None and row[1] <= now):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, key, data, ttl=None):
+        ttl = ttl if ttl is not None else self.ttl
+        now = time.time()
+        try:
+            db = self._connect()
+            with self._lock:
+                with db:
+                    db.execute("INSERT OR REPLACE INTO entries (key, value, size, accessed_at, expires_at) "
+                               "VALUES (?, ?, ?, ?, ?)", (key, data, len(data), now, now + ttl if ttl else None))
+                self._writes += 1
+                should_evict = self._writes % self.evict_every == 1
+        except sqlite3.Error as e:
+            print(f"SQLite cache write error: {e}")
+            return
+        if should_evict:
+            self.evict()
+
+    def delete(self, key):
+        try:
+            db = self._connect()
+            with self._lock:
+                with db:
+                    db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            print(f"SQLite cache delete error: {e}")
+
+    def evict(self):
+        """Drop expired entries, then least recently read ones until back under 90% of max_bytes"""
+        try:
+            db = self._connect()
+            with self._lock:
+                with db:
+                    expired = db.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                                         (time.time(),)).rowcount
+                    total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                    removed = 0
+                    if total > self.max_bytes:
+                        target = self.max_bytes * 0.9
+                        doomed = []
+                        for key, size in db.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+                            if total <= target:
+                                break
+                            doomed.append((key,))
+                            total -= size
+                        db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+                        removed = len(doomed)
+                self.evictions += expired + removed
+        except sqlite3.Error as e:
+            # Nothing evicted this time; the next write tries again
+            print(f"SQLite cache eviction error: {e}")
+            return None
+        return total
+
+    def stats(self):
+        try:
+            db = self._connect()
+            with self._lock:
+                entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        except sqlite3.Error as e:
+            print(f"SQLite cache stats error: {e}")
+            entries, size = None, None
+        return {
+            'path': self.path,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional shared DiskCache or SQLiteCache"""
+
+    def __init__(self, memory, disk=None, encode=None, decode=None):
+        self.memory = memory
+        self.disk = disk
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda data: data)
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        if self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                value = self.decode(data)
+                self.memory.set(key, value)
+                return value
+        return None
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, self.encode(value))
+
+    def delete(self, key):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def stats(self):
+        memory = self.memory.stats()
+        disk = self.disk.stats() if self.disk is not None else None
+        hits = memory['hits'] + (disk['hits'] if disk else 0)
+        lookups = memory['hits'] + memory['misses']
+        return {
+            'hits': hits,
+            'misses': lookups - hits,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'memory': memory,
+            'disk': disk,
+        }
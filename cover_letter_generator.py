@@ -1,29 +1,65 @@
-from groq import Groq
 import os
 from dotenv import load_dotenv
 from datetime import datetime
+from concurrent.futures import wait
+from executors import get_executor
+from llm_gateway import get_gateway
+from prompt_budget import compress, shared_model
 
 load_dotenv()
 
 class CoverLetterGenerator:
-    def __init__(self, groq_api_key=None):
-        self.groq_client = Groq(
-            api_key=groq_api_key or os.getenv('GROQ_API_KEY')
-        )
+    def __init__(self, groq_api_key=None, llm_priority='interactive'):
+        self.llm = get_gateway(groq_api_key)
+        self.groq_client = self.llm.client
+        self.llm_priority = llm_priority
         self.model = os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant')
+
+    def _complete(self, messages, model, **params):
+        """Chat completion text through the shared gateway, cached for repeated prompts"""
+        return self.llm.complete(messages, model, priority=self.llm_priority, **params)
     
     def generate_cover_letter(self, resume_text: str, job_description: str, 
                             company_name: str, position: str, tone: str = "professional") -> str:
         """Generate AI-powered cover letter"""
         try:
-            prompt = f"""
+            return self._complete(
+                messages=self._cover_letter_messages(resume_text, job_description, company_name, position, tone),
+                model=self.model,
+                max_tokens=800,
+                temperature=0.3
+            )
+            
+        except Exception as e:
+            print(f"Groq API error: {e}")
+            return self._get_fallback_cover_letter(company_name, position, tone)
+
+    def stream_cover_letter(self, resume_text: str, job_description: str,
+                            company_name: str, position: str, tone: str = "professional"):
+        """Yield the cover letter in chunks as the model writes it"""
+        started = False
+        try:
+            messages = self._cover_letter_messages(resume_text, job_description, company_name, position, tone)
+            for chunk in self.llm.stream(messages, self.model, priority=self.llm_priority,
+                                         max_tokens=800, temperature=0.3):
+                started = True
+                yield chunk
+        except Exception as e:
+            print(f"Groq API error: {e}")
+            if started:
+                raise
+            yield self._get_fallback_cover_letter(company_name, position, tone)
+
+    def _cover_letter_messages(self, resume_text: str, job_description: str,
+                               company_name: str, position: str, tone: str) -> list:
+        prompt = f"""
 Write a compelling cover letter for the following job application:
 
 RESUME SUMMARY:
-{resume_text[:1000]}
+{compress(resume_text, job_description, budget_tokens=250, model=shared_model())}
 
 JOB DESCRIPTION:
-{job_description[:1000]}
+{compress(job_description, resume_text, budget_tokens=250, model=shared_model())}
 
 DETAILS:
 - Company: {company_name}
@@ -47,22 +83,10 @@ Format the cover letter properly with:
 - Body paragraphs
 - Professional closing
 """
-            
-            response = self.groq_client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": f"You are an expert cover letter writer. Create compelling, personalized cover letters that highlight the candidate's strengths and match them to job requirements. Use a {tone} tone."},
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.model,
-                max_tokens=800,
-                temperature=0.3
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            print(f"Groq API error: {e}")
-            return self._get_fallback_cover_letter(company_name, position, tone)
+        return [
+            {"role": "system", "content": f"You are an expert cover letter writer. Create compelling, personalized cover letters that highlight the candidate's strengths and match them to job requirements. Use a {tone} tone."},
+            {"role": "user", "content": prompt}
+        ]
     
     def _get_fallback_cover_letter(self, company_name: str, position: str, tone: str) -> str:
         """Fallback cover letter template"""
@@ -88,22 +112,54 @@ Note: This is a template cover letter. For a more personalized version, please e
 """
     
     def generate_multiple_versions(self, resume_text: str, job_description: str, 
-                                 company_name: str, position: str) -> dict:
-        """Generate multiple cover letter versions with different tones"""
-        versions = {}
-        tones = ["professional", "enthusiastic", "creative"]
+                                 company_name: str, position: str, tones: list = None,
+                                 industry: str = None, deadline: float = None) -> dict:
+        """Generate multiple cover letter versions with different tones.
+
+        The tones are written concurrently and, given an industry, each letter
+        is customized as soon as its own draft is ready. Versions that fail or
+        miss the overall deadline get the fallback letter without holding up
+        the others.
+        """
+        tones = tones or ["professional", "enthusiastic", "creative"]
+        if deadline is None:
+            deadline = float(os.getenv('COVER_LETTER_DEADLINE', 30))
+        executor = get_executor('cover-letter', int(os.getenv('COVER_LETTER_WORKERS', 6)))
+        futures = {
+            executor.submit(
+                self._generate_version, resume_text, job_description, company_name, position, tone, industry
+            ): tone
+            for tone in tones
+        }
+        done, pending = wait(futures, timeout=deadline)
         
-        for tone in tones:
+        versions = {}
+        for future, tone in futures.items():
+            if future in pending:
+                future.cancel()
+                print(f"Error generating {tone} version: no answer within {deadline}s")
+                versions[tone] = self._get_fallback_cover_letter(company_name, position, tone)
+                continue
             try:
-                cover_letter = self.generate_cover_letter(
-                    resume_text, job_description, company_name, position, tone
-                )
-                versions[tone] = cover_letter
+                versions[tone] = future.result()
             except Exception as e:
                 print(f"Error generating {tone} version: {e}")
                 versions[tone] = self._get_fallback_cover_letter(company_name, position, tone)
         
         return versions
+
+    def _generate_version(self, resume_text: str, job_description: str, company_name: str,
+                          position: str, tone: str, industry: str = None) -> str:
+        # Unlike generate_cover_letter this raises on failure, so a fallback letter is never customized
+        cover_letter = self._complete(
+            messages=self._cover_letter_messages(resume_text, job_description, company_name, position, tone),
+            model=self.model,
+            max_tokens=800,
+            temperature=0.3
+        )
+        if industry:
+            cover_letter = self.customize_for_industry(cover_letter, industry)
+        return cover_letter
     
     def customize_for_industry(self, base_cover_letter: str, industry: str) -> str:
         """Customize cover letter for specific industry"""
@@ -124,7 +180,7 @@ REQUIREMENTS:
 Return the customized cover letter.
 """
             
-            response = self.groq_client.chat.completions.create(
+            content = self._complete(
                 messages=[
                     {"role": "system", "content": f"You are an expert in {industry} industry recruitment. Customize cover letters to highlight industry-relevant skills and knowledge."},
                     {"role": "user", "content": prompt}
@@ -134,7 +190,7 @@ Return the customized cover letter.
                 temperature=0.2
             )
             
-            return response.choices[0].message.content
+            return content
             
         except Exception as e:
             print(f"Industry customization error: {e}")
@@ -0,0 +1,35 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name, workers, processes=False):
+    """Process-wide pool for name and size, created on first use.
+
+    Every instance and request in a process shares it, so the work it runs
+    is bounded per process. Pools are created lazily and forgotten in a
+    forked child, so each gunicorn worker owns its own.
+    """
+    key = (name, workers, processes)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            if processes:
+                executor = ProcessPoolExecutor(max_workers=workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+            _executors[key] = executor
+        return executor
+
+
+def _forget_after_fork():
+    # The parent's pool threads and processes do not exist in the child
+    global _executors_lock
+    _executors.clear()
+    _executors_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_after_fork)
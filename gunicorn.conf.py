@@ -0,0 +1,38 @@
+"""Gunicorn settings, picked up automatically by `gunicorn app_flask:app`."""
+import os
+import subprocess
+import sys
+
+# Import the app once in the master and fork workers from it, so every worker
+# shares the already-imported libraries and memory-mapped models.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Worker count comes from WEB_CONCURRENCY (set by Heroku per dyno size); the LLM
+# gateway divides LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE by it, because
+# each worker throttles on its own. Set LLM_PROCESSES if workers are set another way.
+
+# job_ingest.py runs next to the web workers so it fills the same data/job_store.db
+# (a separate Heroku dyno would have a disk of its own)
+ingest_in_web = os.getenv('JOB_INGEST_IN_WEB', 'true').lower() == 'true'
+_ingest_process = None
+
+
+def when_ready(server):
+    global _ingest_process
+    if preload_app:
+        import app_flask
+        app_flask.warm_up()
+        server.log.info("Shared models warmed up before forking workers")
+    if ingest_in_web:
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_ingest.py')
+        _ingest_process = subprocess.Popen([sys.executable, script, '--index'])
+        server.log.info("Started job ingestion (pid %s)", _ingest_process.pid)
+
+
+def on_exit(server):
+    if _ingest_process is not None and _ingest_process.poll() is None:
+        _ingest_process.terminate()
+        try:
+            _ingest_process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            _ingest_process.kill()
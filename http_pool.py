@@ -0,0 +1,128 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes 'br' when it is installed)
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+
+class PoolStats:
+    """Request and connection counters for one pooled session"""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.failed_connections = 0
+        self.handshake_seconds = 0.0
+        self.max_handshake_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self, seconds, failed=False):
+        with self._lock:
+            if failed:
+                self.failed_connections += 1
+                return
+            self.new_connections += 1
+            self.handshake_seconds += seconds
+            self.max_handshake_seconds = max(self.max_handshake_seconds, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            # A failed connect was still a request that found no open connection to reuse
+            reused = max(0, self.requests - self.new_connections - self.failed_connections)
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'failed_connections': self.failed_connections,
+                'reuse_rate': round(reused / self.requests, 4) if self.requests else 0.0,
+                'avg_handshake_ms': round(self.handshake_seconds * 1000 / self.new_connections, 2)
+                                    if self.new_connections else 0.0,
+                'max_handshake_ms': round(self.max_handshake_seconds * 1000, 2),
+            }
+
+
+def _timed_connection(connection_cls, stats):
+    class TimedConnection(connection_cls):
+        def connect(self):
+            # TCP connect plus, for HTTPS, the TLS handshake
+            started = time.perf_counter()
+            failed = True
+            try:
+                super().connect()
+                failed = False
+            finally:
+                stats.record_connection(time.perf_counter() - started, failed)
+
+    return TimedConnection
+
+
+def _timed_pool(pool_cls, connection_cls, stats, pool_timeout):
+    def urlopen(self, method, url, *args, pool_timeout=None, **kwargs):
+        # requests never passes pool_timeout, which would make a full blocking pool wait forever
+        pool_timeout = pool_timeout if pool_timeout is not None else self.default_pool_timeout
+        return pool_cls.urlopen(self, method, url, *args, pool_timeout=pool_timeout, **kwargs)
+
+    return type(pool_cls.__name__, (pool_cls,), {
+        'ConnectionCls': _timed_connection(connection_cls, stats),
+        'default_pool_timeout': pool_timeout,
+        'urlopen': urlopen,
+    })
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools time every new connection into a PoolStats.
+
+    With pool_block=True a request waits up to ``pool_timeout`` seconds for
+    a free connection when all pool_maxsize are busy, and then fails with
+    urllib3's EmptyPoolError, instead of opening one more.
+    """
+
+    def __init__(self, stats, pool_timeout=None, **kwargs):
+        self.stats = stats
+        self.pool_timeout = pool_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _timed_pool(HTTPConnectionPool, HTTPConnection, self.stats, self.pool_timeout),
+            'https': _timed_pool(HTTPSConnectionPool, HTTPSConnection, self.stats, self.pool_timeout),
+        }
+
+    def send(self, request, **kwargs):
+        self.stats.record_request()
+        return super().send(request, **kwargs)
+
+
+def pooled_session(max_connections=10, headers=None, pool_timeout=10.0):
+    """requests.Session with keep-alive, compression and at most max_connections per host.
+
+    Returns (session, stats). Connections stay open between calls, so only
+    the first request to a host (or one beyond the pool's current size)
+    pays for the TCP and TLS handshake. A request that finds all
+    max_connections busy waits up to pool_timeout seconds for one.
+    """
+    stats = PoolStats()
+    session = requests.Session()
+    adapter = PooledAdapter(stats, pool_timeout=pool_timeout, pool_connections=4, pool_maxsize=max_connections,
+                            pool_block=True)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'Accept-Encoding': ACCEPT_ENCODING, 'Connection': 'keep-alive'})
+    session.headers.update(headers or {})
+    return session, stats
@@ -1,156 +1,319 @@
 import requests
+import hashlib
 import json
+import threading
+import time
+from concurrent.futures import as_completed
 from typing import List, Dict
 import os
 from dotenv import load_dotenv
+from cache import LRUCache, SQLiteCache, TieredCache
+from executors import get_executor
+from http_pool import pooled_session
+from job_snapshot import BoardSnapshot
 
 load_dotenv()
 
 class JobAPI:
+    PROVIDERS = ('adzuna', 'jsearch', 'remotive', 'arbeitnow')
+
     def __init__(self):
         # Using free job APIs
         self.adzuna_app_id = os.getenv('ADZUNA_APP_ID', 'demo')
         self.adzuna_api_key = os.getenv('ADZUNA_API_KEY', 'demo')
         self.rapidapi_key = os.getenv('RAPIDAPI_KEY', '')
+        # Base URLs can point at local stub servers for testing
+        self.adzuna_url = os.getenv('ADZUNA_BASE_URL', 'https://api.adzuna.com')
+        self.jsearch_url = os.getenv('JSEARCH_BASE_URL', 'https://jsearch.p.rapidapi.com')
+        self.remotive_url = os.getenv('REMOTIVE_BASE_URL', 'https://remotive.com')
+        self.arbeitnow_url = os.getenv('ARBEITNOW_BASE_URL', 'https://arbeitnow.com')
+        # Overall time budget for one search across all providers
+        self.deadline = float(os.getenv('JOB_SEARCH_DEADLINE', 8))
+        # (connect, read): a dead host fails fast instead of eating the whole deadline
+        self.timeout = (float(os.getenv('JOB_CONNECT_TIMEOUT', 3.05)),
+                        float(os.getenv('JOB_READ_TIMEOUT', min(10, self.deadline))))
+        # One keep-alive session per provider host, so searches reuse open connections
+        max_connections = int(os.getenv('JOB_POOL_MAXSIZE', 10))
+        # How long a request waits for a free connection once all max_connections are busy
+        pool_timeout = float(os.getenv('JOB_POOL_TIMEOUT', self.timeout[0]))
+        self.sessions = {}
+        self.session_stats = {}
+        for name in self.PROVIDERS:
+            self.sessions[name], self.session_stats[name] = pooled_session(max_connections, pool_timeout=pool_timeout)
+        # Provider answers per normalized query: fresh for cache_ttl, then served stale
+        # (while a background refresh runs) for up to stale_ttl more
+        self.cache_ttl = int(os.getenv('JOB_CACHE_TTL', 600))
+        self.stale_ttl = int(os.getenv('JOB_CACHE_STALE_TTL', 3600))
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        self._revalidating = set()
+        self._revalidating_lock = threading.Lock()
+        # Arbeitnow only offers its whole board, so it is searched from a local snapshot
+        self.arbeitnow_snapshot = BoardSnapshot(
+            self._fetch_arbeitnow_board,
+            os.getenv('ARBEITNOW_SNAPSHOT_PATH', 'data/arbeitnow_snapshot.json'),
+            refresh_interval=int(os.getenv('ARBEITNOW_REFRESH_INTERVAL', 900)),
+        )
+
+    @property
+    def cache(self):
+        """The provider answer cache, opened on first use rather than at import in the gunicorn master"""
+        with self._cache_lock:
+            if self._cache is None:
+                self._cache = TieredCache(
+                    LRUCache(max_bytes=int(os.getenv('JOB_CACHE_MEMORY_BYTES', 16 * 1024 * 1024)),
+                             ttl=self.cache_ttl + self.stale_ttl),
+                    SQLiteCache(os.getenv('JOB_CACHE_PATH', 'cache/job_search.db'),
+                                max_bytes=int(os.getenv('JOB_CACHE_DISK_BYTES', 64 * 1024 * 1024)),
+                                ttl=self.cache_ttl + self.stale_ttl),
+                )
+            return self._cache
 
     def search_jobs(self, job_title: str, location: str = "", experience_level: str = "") -> List[Dict]:
         """Search for jobs using multiple free APIs"""
-        jobs = []
-        
-        # Try Adzuna
-        jobs.extend(self._search_adzuna(job_title, location))
-
-        # Try JSearch (RapidAPI)
-        jobs.extend(self._search_jsearch(job_title, location))
+        return self.search_jobs_detailed(job_title, location, experience_level)['jobs']
 
-        # Try Remotive (Remote jobs, free)
-        jobs.extend(self._search_remotive(job_title))
+    def search_jobs_detailed(self, job_title: str, location: str = "", experience_level: str = "",
+                             deadline: float = None, limit: int = 20, use_cache: bool = True) -> Dict:
+        """Query every provider concurrently and return what answered within the deadline.
 
-        # Try Arbeitnow (General job board API)
-        jobs.extend(self._search_arbeitnow(job_title, location))
+        Returns {'jobs': [...], 'providers': {name: {'status', 'count', 'latency_ms', 'cache'[, 'error']}}},
+        with status one of ok, error, timeout or skipped and cache one of fresh, stale, miss or
+        refresh (use_cache=False: the providers were called and the cache overwritten).
+        """
+        answers = {name: (jobs, status) for name, jobs, status
+                   in self.iter_search(job_title, location, experience_level, deadline, use_cache)}
+        jobs = []
+        status = {}
+        for name in self.PROVIDERS:  # Results keep the provider order regardless of who answered first
+            provider_jobs, status[name] = answers[name]
+            jobs.extend(provider_jobs)
 
         # If no results, return mock data for demo
         if not jobs:
             jobs = self._get_mock_jobs(job_title, location)
 
-        return jobs[:20]  # Limit to 20 results
+        return {'jobs': jobs[:limit], 'providers': status}
+
+    def iter_search(self, job_title: str, location: str = "", experience_level: str = "", deadline: float = None,
+                    use_cache: bool = True):
+        """Yield (provider, jobs, status) for every provider as soon as it answers.
+
+        Skipped providers come first, then answers in arrival order, then the
+        providers that missed the deadline (with no jobs).
+        """
+        deadline = deadline or self.deadline
+        providers = {
+            'adzuna': lambda: self._cached('adzuna', job_title, location,
+                                           lambda: self._search_adzuna(job_title, location), use_cache),
+            # JSearch (RapidAPI) needs a key
+            'jsearch': (lambda: self._cached('jsearch', job_title, location,
+                                             lambda: self._search_jsearch(job_title, location), use_cache))
+                       if self.rapidapi_key else None,
+            # Remotive (Remote jobs, free)
+            'remotive': lambda: self._cached('remotive', job_title, '', lambda: self._search_remotive(job_title),
+                                             use_cache),
+            # Arbeitnow (General job board API)
+            'arbeitnow': lambda: self.arbeitnow_snapshot.search(job_title),
+        }
+        executor = get_executor('job-provider', int(os.getenv('JOB_SEARCH_WORKERS', 8)))
+
+        started = time.perf_counter()
+        futures = {executor.submit(self._timed, search): name
+                   for name, search in providers.items() if search is not None}
+        for name, search in providers.items():
+            if search is None:
+                yield name, [], {'status': 'skipped', 'count': 0, 'latency_ms': 0, 'cache': None}
+
+        pending = set(futures)
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                pending.discard(future)
+                yield (futures[future],) + self._answer(futures[future], future)
+        except TimeoutError:
+            for future in pending:
+                name = futures[future]
+                if future.done():  # Finished just as the deadline passed
+                    yield (name,) + self._answer(name, future)
+                    continue
+                future.cancel()
+                print(f"{name} API error: no answer within {deadline}s")
+                yield name, [], {'status': 'timeout', 'count': 0,
+                                 'latency_ms': round((time.perf_counter() - started) * 1000), 'cache': 'miss'}
+
+    def _answer(self, name, future):
+        (jobs, cache_state), latency, error = future.result()
+        status = {'status': 'error' if error else 'ok', 'count': len(jobs),
+                  'latency_ms': round(latency * 1000), 'cache': cache_state}
+        if error:
+            print(f"{name} API error: {error}")
+            status['error'] = error
+        return jobs, status
+
+    def _timed(self, search):
+        started = time.perf_counter()
+        try:
+            return search(), time.perf_counter() - started, None
+        except requests.HTTPError as e:
+            # Not str(e): it contains the request URL, and with it the API keys
+            return ([], 'miss'), time.perf_counter() - started, f"HTTP {e.response.status_code}"
+        except Exception as e:
+            return ([], 'miss'), time.perf_counter() - started, type(e).__name__
+
+    def http_stats(self) -> Dict:
+        """Connection reuse and handshake time per provider session"""
+        return {name: stats.snapshot() for name, stats in self.session_stats.items()}
+
+    def _cache_key(self, provider, job_title, location):
+        query = '|'.join(' '.join(part.lower().split()) for part in (provider, job_title, location))
+        return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+    def _cached(self, provider, job_title, location, search, use_cache=True):
+        """(jobs, cache state) for one provider query, with stale-while-revalidate"""
+        key = self._cache_key(provider, job_title, location)
+        if not use_cache:
+            jobs = search()
+            self._store(key, jobs)
+            return jobs, 'refresh'
+        data = self.cache.get(key)
+        if data is not None:
+            entry = json.loads(data)
+            if time.time() - entry['fetched_at'] < self.cache_ttl:
+                return entry['jobs'], 'fresh'
+            self._revalidate(key, search)
+            return entry['jobs'], 'stale'
+        jobs = search()
+        self._store(key, jobs)
+        return jobs, 'miss'
+
+    def _store(self, key, jobs):
+        self.cache.set(key, json.dumps({'jobs': jobs, 'fetched_at': time.time()}).encode('utf-8'))
+
+    def _revalidate(self, key, search):
+        with self._revalidating_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def refresh():
+            try:
+                self._store(key, search())
+            except Exception as e:
+                # The stale answer keeps being served until the entry expires
+                print(f"Job cache refresh error: {e}")
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=refresh, daemon=True, name='job-cache-refresh').start()
 
     # ------------------ API Implementations ------------------
+    # Errors propagate to search_jobs_detailed, which reports them per provider
 
     def _search_adzuna(self, job_title: str, location: str) -> List[Dict]:
         """Search jobs using Adzuna API"""
-        try:
-            url = "https://api.adzuna.com/v1/api/jobs/us/search/1"
-            params = {
-                'app_id': self.adzuna_app_id,
-                'app_key': self.adzuna_api_key,
-                'what': job_title,
-                'where': location,
-                'results_per_page': 10,
-                'sort_by': 'relevance'
-            }
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                jobs = []
-                for job in data.get('results', []):
-                    jobs.append({
-                        'title': job.get('title', ''),
-                        'company': job.get('company', {}).get('display_name', ''),
-                        'location': job.get('location', {}).get('display_name', ''),
-                        'salary': self._format_salary(job.get('salary_min'), job.get('salary_max')),
-                        'description': job.get('description', ''),
-                        'url': job.get('redirect_url', ''),
-                        'source': 'Adzuna'
-                    })
-                return jobs
-        except Exception as e:
-            print(f"Adzuna API error: {e}")
-        return []
+        url = f"{self.adzuna_url}/v1/api/jobs/us/search/1"
+        params = {
+            'app_id': self.adzuna_app_id,
+            'app_key': self.adzuna_api_key,
+            'what': job_title,
+            'where': location,
+            'results_per_page': 10,
+            'sort_by': 'relevance'
+        }
+        response = self.sessions['adzuna'].get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        jobs = []
+        for job in data.get('results', []):
+            jobs.append({
+                'title': job.get('title', ''),
+                'company': job.get('company', {}).get('display_name', ''),
+                'location': job.get('location', {}).get('display_name', ''),
+                'salary': self._format_salary(job.get('salary_min'), job.get('salary_max')),
+                'description': job.get('description', ''),
+                'url': job.get('redirect_url', ''),
+                'source': 'Adzuna'
+            })
+        return jobs
 
     def _search_jsearch(self, job_title: str, location: str) -> List[Dict]:
         """Search jobs using JSearch API (RapidAPI)"""
-        try:
-            if not self.rapidapi_key:
-                return []
-            
-            url = "https://jsearch.p.rapidapi.com/search"
-            querystring = {
-                "query": f"{job_title} {location}",
-                "page": "1",
-                "num_pages": "1"
-            }
-            headers = {
-                "X-RapidAPI-Key": self.rapidapi_key,
-                "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
-            }
-            response = requests.get(url, headers=headers, params=querystring, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                jobs = []
-                for job in data.get('data', []):
-                    jobs.append({
-                        'title': job.get('job_title', ''),
-                        'company': job.get('employer_name', ''),
-                        'location': f"{job.get('job_city', '')}, {job.get('job_state', '')}",
-                        'salary': job.get('job_salary', 'Not specified'),
-                        'description': job.get('job_description', ''),
-                        'url': job.get('job_apply_link', ''),
-                        'source': 'JSearch'
-                    })
-                return jobs
-        except Exception as e:
-            print(f"JSearch API error: {e}")
-        return []
+        if not self.rapidapi_key:
+            return []
+        
+        url = f"{self.jsearch_url}/search"
+        querystring = {
+            "query": f"{job_title} {location}",
+            "page": "1",
+            "num_pages": "1"
+        }
+        headers = {
+            "X-RapidAPI-Key": self.rapidapi_key,
+            "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
+        }
+        response = self.sessions['jsearch'].get(url, headers=headers, params=querystring, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        jobs = []
+        for job in data.get('data', []):
+            jobs.append({
+                'title': job.get('job_title', ''),
+                'company': job.get('employer_name', ''),
+                'location': f"{job.get('job_city', '')}, {job.get('job_state', '')}",
+                'salary': job.get('job_salary', 'Not specified'),
+                'description': job.get('job_description', ''),
+                'url': job.get('job_apply_link', ''),
+                'source': 'JSearch'
+            })
+        return jobs
 
     def _search_remotive(self, job_title: str) -> List[Dict]:
         """Search jobs using Remotive API (Free, No Auth)"""
-        try:
-            url = "https://remotive.com/api/remote-jobs"
-            params = {"search": job_title}
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                jobs = []
-                for job in data.get("jobs", []):
-                    jobs.append({
-                        'title': job.get('title', ''),
-                        'company': job.get('company_name', ''),
-                        'location': job.get('candidate_required_location', ''),
-                        'salary': job.get('salary', 'Not specified'),
-                        'description': job.get('description', ''),
-                        'url': job.get('url', ''),
-                        'source': 'Remotive'
-                    })
-                return jobs
-        except Exception as e:
-            print(f"Remotive API error: {e}")
-        return []
+        url = f"{self.remotive_url}/api/remote-jobs"
+        params = {"search": job_title}
+        response = self.sessions['remotive'].get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        jobs = []
+        for job in data.get("jobs", []):
+            jobs.append({
+                'title': job.get('title', ''),
+                'company': job.get('company_name', ''),
+                'location': job.get('candidate_required_location', ''),
+                'salary': job.get('salary', 'Not specified'),
+                'description': job.get('description', ''),
+                'url': job.get('url', ''),
+                'source': 'Remotive'
+            })
+        return jobs
 
-    def _search_arbeitnow(self, job_title: str, location: str) -> List[Dict]:
-        """Search jobs using Arbeitnow Job Board API"""
-        try:
-            url = "https://arbeitnow.com/api/job-board-api"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                jobs = []
-                for job in data.get("data", []):
-                    title = job.get('title', '')
-                    if job_title.lower() in title.lower():
-                        jobs.append({
-                            'title': title,
-                            'company': job.get('company_name', ''),
-                            'location': job.get('location', ''),
-                            'salary': 'Not specified',
-                            'description': job.get('description', ''),
-                            'url': job.get('url', ''),
-                            'source': 'Arbeitnow'
-                        })
-                return jobs
-        except Exception as e:
-            print(f"Arbeitnow API error: {e}")
-        return []
+    def _fetch_arbeitnow_board(self) -> List[Dict]:
+        """Download the Arbeitnow Job Board API (the whole board; it has no search)"""
+        jobs = []
+        seen = set()
+        for page in range(1, int(os.getenv('ARBEITNOW_SNAPSHOT_PAGES', 3)) + 1):
+            url = f"{self.arbeitnow_url}/api/job-board-api"
+            response = self.sessions['arbeitnow'].get(url, params={'page': page}, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+            for job in data.get("data", []):
+                key = job.get('slug') or job.get('url')
+                if key in seen:
+                    continue
+                seen.add(key)
+                jobs.append({
+                    'title': job.get('title', ''),
+                    'company': job.get('company_name', ''),
+                    'location': job.get('location', ''),
+                    'salary': 'Not specified',
+                    'description': job.get('description', ''),
+                    'url': job.get('url', ''),
+                    'source': 'Arbeitnow'
+                })
+            if not (data.get('links') or {}).get('next'):
+                break
+        return jobs
 
     # ------------------ Helpers ------------------
 
@@ -0,0 +1,288 @@
+import hashlib
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+
+from ats_analyzer import extract_keywords, job_text
+from tfidf_model import TfidfModel
+
+
+def job_id_for(job):
+    """Stable id for a job dict: its own id, else a hash of its URL or title/company/location"""
+    if job.get('id'):
+        return str(job['id'])
+    basis = job.get('url') or '|'.join(job.get(field, '') for field in ('title', 'company', 'location'))
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()
+
+
+class JobIndex:
+    """Persistent, incrementally updated similarity index over job postings.
+
+    Each posting's TF-IDF vector and its keyword set (extract_keywords) are
+    stored in SQLite and mirrored in memory together with an inverted index
+    keyword -> posting ids. A query only scores the postings that share at
+    least one keyword with the resume, so the catalog is never rescanned.
+    Every add/delete is appended to a change log that other processes
+    replay in ``refresh``, keeping gunicorn workers and the ingestion job in
+    sync without reloading the whole index. Each process records how far
+    it has replayed, so ``compact_changes`` can drop the entries every
+    active reader has seen; a reader that fell behind a compaction reloads.
+
+    Keywords carried by more than ``max_keyword_share`` of a large catalog
+    ("experience", "with", ...) are too common to narrow anything down and
+    are skipped when picking candidates, and at most ``max_candidates``
+    postings (those sharing the most keywords with the resume) are scored.
+    """
+
+    def __init__(self, path=None, model=None, refresh_interval=5.0, max_candidates=None, max_keyword_share=None):
+        self.path = path or os.getenv('JOB_INDEX_PATH', 'data/job_index.db')
+        self.model = model or TfidfModel.load_or_hashing()
+        self.refresh_interval = refresh_interval
+        self.max_candidates = max_candidates or int(os.getenv('JOB_INDEX_MAX_CANDIDATES', 2000))
+        self.max_keyword_share = max_keyword_share or float(os.getenv('JOB_INDEX_MAX_KEYWORD_SHARE', 0.2))
+        self._reader = uuid.uuid4().hex
+        self._lock = threading.RLock()
+        self._jobs = {}       # id -> job dict
+        self._vectors = {}    # id -> 1 x n_features CSR row
+        self._keywords = {}   # id -> set of keywords
+        self._expires = {}    # id -> expiry timestamp or None
+        self._inverted = {}   # keyword -> set of ids
+        self._last_change = 0
+        self._last_refresh = 0.0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS postings (
+                id TEXT PRIMARY KEY,
+                job TEXT NOT NULL,
+                keywords TEXT NOT NULL,
+                indices BLOB NOT NULL,
+                data BLOB NOT NULL,
+                expires_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                posting_id TEXT NOT NULL,
+                op TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS readers (
+                reader TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL,
+                seen_at REAL NOT NULL
+            );
+        """)
+        self._check_model()
+        self._load()
+
+    def _check_model(self):
+        signature = self.model.signature
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'model'").fetchone()
+        if row and row[0] != signature:
+            # Vectors from another model are not comparable; re-vectorize the stored postings
+            print(f"Job index model changed ({row[0]} -> {signature}), re-vectorizing postings")
+            jobs = [(posting_id, json.loads(job)) for posting_id, job in self._db.execute("SELECT id, job FROM postings")]
+            with self._db:
+                for posting_id, job in jobs:
+                    vector = self.model.transform([job_text(job)])
+                    self._db.execute("UPDATE postings SET indices = ?, data = ? WHERE id = ?",
+                                     (*self._encode_vector(vector), posting_id))
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('model', ?)", (signature,))
+
+    def _load(self):
+        with self._lock:
+            for index in (self._jobs, self._vectors, self._keywords, self._expires, self._inverted):
+                index.clear()
+            row = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()
+            self._last_change = max(row[0], self._compacted_through())
+            for posting in self._db.execute("SELECT id, job, keywords, indices, data, expires_at FROM postings"):
+                self._index_row(*posting)
+            self._last_refresh = time.time()
+
+    def _encode_vector(self, vector):
+        return vector.indices.astype(np.int32).tobytes(), vector.data.astype(np.float32).tobytes()
+
+    def _decode_vector(self, indices, data):
+        indices = np.frombuffer(indices, dtype=np.int32)
+        data = np.frombuffer(data, dtype=np.float32).astype(np.float64)
+        return sp.csr_matrix((data, indices, [0, len(indices)]), shape=(1, self.model.n_features))
+
+    def _index_row(self, posting_id, job, keywords, indices, data, expires_at):
+        self._unindex(posting_id)
+        keywords = set(json.loads(keywords))
+        self._jobs[posting_id] = json.loads(job)
+        self._vectors[posting_id] = self._decode_vector(indices, data)
+        self._keywords[posting_id] = keywords
+        self._expires[posting_id] = expires_at
+        for keyword in keywords:
+            self._inverted.setdefault(keyword, set()).add(posting_id)
+
+    def _unindex(self, posting_id):
+        for keyword in self._keywords.pop(posting_id, ()):
+            ids = self._inverted.get(keyword)
+            if ids is not None:
+                ids.discard(posting_id)
+                if not ids:
+                    del self._inverted[keyword]
+        self._jobs.pop(posting_id, None)
+        self._vectors.pop(posting_id, None)
+        self._expires.pop(posting_id, None)
+
+    def add(self, job, job_id=None, ttl=None):
+        """Index (or re-index) one posting; returns its id"""
+        return self.add_many([job], ttl=ttl, job_ids=[job_id] if job_id else None)[0]
+
+    def add_many(self, jobs, ttl=None, job_ids=None):
+        """Index postings in one batch: one transform call and one transaction"""
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        job_ids = job_ids or [job_id_for(job) for job in jobs]
+        texts = [job_text(job) for job in jobs]
+        vectors = self.model.transform(texts)
+        expires_at = time.time() + ttl if ttl else None
+
+        rows = []
+        for i, (posting_id, job, text) in enumerate(zip(job_ids, jobs, texts)):
+            indices, data = self._encode_vector(vectors[i])
+            rows.append((posting_id, json.dumps(job), json.dumps(sorted(extract_keywords(text))), indices, data, expires_at))
+
+        with self._lock:
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO postings (id, job, keywords, indices, data, expires_at) "
+                                     "VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._db.executemany("INSERT INTO changes (posting_id, op) VALUES (?, 'add')",
+                                     [(row[0],) for row in rows])
+            for row in rows:
+                self._index_row(*row)
+        return job_ids
+
+    def delete(self, job_id):
+        self.delete_many([job_id])
+
+    def delete_many(self, job_ids):
+        job_ids = list(job_ids)
+        with self._lock:
+            with self._db:
+                self._db.executemany("DELETE FROM postings WHERE id = ?", [(job_id,) for job_id in job_ids])
+                self._db.executemany("INSERT INTO changes (posting_id, op) VALUES (?, 'delete')",
+                                     [(job_id,) for job_id in job_ids])
+            for job_id in job_ids:
+                self._unindex(job_id)
+
+    def purge_expired(self):
+        """Delete postings whose TTL has passed; returns how many were removed"""
+        with self._lock:
+            expired = [row[0] for row in self._db.execute(
+                "SELECT id FROM postings WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))]
+        if expired:
+            self.delete_many(expired)
+        return len(expired)
+
+    def refresh(self):
+        """Replay adds and deletes made by other processes since the last refresh"""
+        with self._lock:
+            if self._compacted_through() > self._last_change:
+                # Changes this process never saw were compacted away
+                self._load()
+            changes = self._db.execute("SELECT seq, posting_id, op FROM changes WHERE seq > ? ORDER BY seq",
+                                       (self._last_change,)).fetchall()
+            for seq, posting_id, op in changes:
+                if op == 'delete':
+                    self._unindex(posting_id)
+                else:
+                    row = self._db.execute("SELECT id, job, keywords, indices, data, expires_at FROM postings WHERE id = ?",
+                                           (posting_id,)).fetchone()
+                    if row:
+                        self._index_row(*row)
+                self._last_change = seq
+            # Expired postings leave memory here; purge_expired deletes them from the file
+            now = time.time()
+            for job_id in [job_id for job_id, expires_at in self._expires.items() if expires_at and expires_at <= now]:
+                self._unindex(job_id)
+            with self._db:
+                self._db.execute("INSERT OR REPLACE INTO readers (reader, seq, seen_at) VALUES (?, ?, ?)",
+                                 (self._reader, self._last_change, now))
+            self._last_refresh = now
+
+    def _compacted_through(self):
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'compacted_through'").fetchone()
+        return int(row[0]) if row else 0
+
+    def compact_changes(self, reader_timeout=3600):
+        """Drop change log entries every reader active within reader_timeout has replayed"""
+        self.refresh()
+        now = time.time()
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM readers WHERE seen_at < ?", (now - reader_timeout,))
+                row = self._db.execute("SELECT MIN(seq) FROM readers").fetchone()
+                through = row[0] if row[0] is not None else \
+                    self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+                removed = self._db.execute("DELETE FROM changes WHERE seq <= ?", (through,)).rowcount
+                self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('compacted_through', ?)",
+                                 (str(max(through, self._compacted_through())),))
+        return removed
+
+    def query(self, resume_text, top_k=10):
+        """Top-k postings for a resume, scored only over postings sharing a keyword with it"""
+        if time.time() - self._last_refresh > self.refresh_interval:
+            self.refresh()
+
+        resume_keywords = set(extract_keywords(resume_text))
+        now = time.time()
+        with self._lock:
+            postings = [self._inverted[keyword] for keyword in resume_keywords if keyword in self._inverted]
+            if len(self._jobs) >= 100:
+                common = len(self._jobs) * self.max_keyword_share
+                postings = [ids for ids in postings if len(ids) <= common] or postings
+            shared = Counter()
+            for ids in postings:
+                shared.update(ids)
+            candidates = [job_id for job_id in shared
+                          if not self._expires.get(job_id) or self._expires[job_id] > now]
+            if len(candidates) > self.max_candidates:
+                candidates = heapq.nlargest(self.max_candidates, candidates, key=shared.__getitem__)
+            if not candidates:
+                return []
+            matrix = self._stack([self._vectors[job_id] for job_id in candidates])
+            jobs = [(self._jobs[job_id], self._keywords[job_id]) for job_id in candidates]
+
+        scores = (matrix @ self.model.transform([resume_text]).T).toarray().ravel()
+        best = heapq.nlargest(top_k, range(len(candidates)), key=scores.__getitem__)
+        results = []
+        for i in best:
+            job, keywords = jobs[i]
+            result = dict(job)
+            result['id'] = candidates[i]
+            result['match_score'] = int(scores[i] * 100)
+            result['missing_keywords'] = sorted(keywords - resume_keywords)[:15]
+            results.append(result)
+        return results
+
+    def _stack(self, rows):
+        # Much cheaper than sp.vstack for thousands of single-row matrices
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([row.nnz for row in rows], out=indptr[1:])
+        indices = np.concatenate([row.indices for row in rows])
+        data = np.concatenate([row.data for row in rows])
+        return sp.csr_matrix((data, indices, indptr), shape=(len(rows), self.model.n_features))
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def close(self):
+        self._db.close()
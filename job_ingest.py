@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Keep the local job store (job_store.py) filled from the JobAPI providers.
+
+    python job_ingest.py                      # a pass every JOB_INGEST_INTERVAL seconds
+    python job_ingest.py --once --index       # one pass, also feeding /recommended_jobs
+
+Each pass searches every provider for each of JOB_INGEST_QUERIES (comma
+separated) in each of JOB_INGEST_LOCATIONS, adds the whole Arbeitnow
+board, and drops postings no pass has seen within JOB_STORE_TTL. With
+--index it also purges expired postings from the job index and compacts
+the index's change log.
+/search_jobs then answers from the store and only calls the providers
+for searches the store has nothing for.
+
+gunicorn.conf.py starts it alongside the web workers (JOB_INGEST_IN_WEB),
+because the store is a local file that only processes on the same dyno
+can see.
+"""
+import argparse
+import os
+import time
+
+from job_api import JobAPI
+from job_store import JobStore
+
+DEFAULT_QUERIES = ('Software Engineer', 'Python Developer', 'Data Scientist', 'Data Engineer', 'Frontend Developer',
+                   'Backend Engineer', 'DevOps Engineer', 'Machine Learning Engineer', 'Product Manager',
+                   'UX Designer', 'Project Manager', 'Data Analyst')
+
+
+def _env_list(name, default):
+    value = os.getenv(name)
+    return [item.strip() for item in value.split(',')] if value else list(default)
+
+
+def ingest_once(api, store, queries, locations, job_index=None, index_ttl=None):
+    """One pass over every query and location; returns a summary dict"""
+    started = time.perf_counter()
+    added = updated = 0
+    try:
+        # A fresh board, not the snapshot a web search last looked at
+        api.arbeitnow_snapshot.refresh()
+    except Exception as e:
+        print(f"Arbeitnow ingest error: {e}")
+    for query in queries:
+        for location in locations:
+            # Straight from the providers: the search cache would hand back the previous pass
+            result = api.search_jobs_detailed(query, location, limit=None, use_cache=False)
+            jobs = [job for job in result['jobs'] if job.get('source') != 'Demo']
+            new, refreshed = store.add_many(jobs)
+            added += new
+            updated += refreshed
+            if job_index is not None and jobs:
+                job_index.add_many(jobs, ttl=index_ttl)
+    try:
+        board = api.arbeitnow_snapshot.jobs()
+    except Exception as e:
+        print(f"Arbeitnow ingest error: {e}")
+        board = []
+    new, refreshed = store.add_many(board)
+    summary = {}
+    if job_index is not None:
+        if board:
+            job_index.add_many(board, ttl=index_ttl)
+        summary['index_expired'] = job_index.purge_expired()
+        summary['index_changes_compacted'] = job_index.compact_changes()
+    return {
+        **summary,
+        'added': added + new,
+        'updated': updated + refreshed,
+        'expired': store.purge_expired(),
+        'postings': len(store),
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--once', action='store_true', help="run a single pass and exit")
+    arg_parser.add_argument('--interval', type=float, default=float(os.getenv('JOB_INGEST_INTERVAL', 1800)))
+    arg_parser.add_argument('--index', action='store_true', help="also add postings to the /recommended_jobs index")
+    args = arg_parser.parse_args()
+
+    queries = _env_list('JOB_INGEST_QUERIES', DEFAULT_QUERIES)
+    locations = _env_list('JOB_INGEST_LOCATIONS', [''])
+    api = JobAPI()
+    store = JobStore()
+    job_index = None
+    index_ttl = int(os.getenv('JOB_INDEX_TTL', 7 * 24 * 3600))
+    if args.index:
+        from job_index import JobIndex
+        job_index = JobIndex()
+
+    while True:
+        try:
+            summary = ingest_once(api, store, queries, locations, job_index, index_ttl)
+            print(f"Job ingest: {summary}", flush=True)
+        except Exception as e:
+            print(f"Job ingest error: {e}", flush=True)
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+from keyword_matcher import tokenize
+
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+class BoardSnapshot:
+    """Local, periodically refreshed copy of a job board that can only be downloaded whole.
+
+    Arbeitnow has no search endpoint, so instead of downloading the board on
+    every search the postings are kept in memory (and in a JSON file shared
+    by workers and restarts) with inverted indexes token -> postings over
+    titles and over title + description. Searches intersect the posting
+    sets of the query's tokens. A snapshot older than ``refresh_interval``
+    keeps answering while one background refresh replaces it.
+    """
+
+    def __init__(self, fetch, path, refresh_interval=900):
+        self.fetch = fetch
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._jobs = []
+        self._title_index = {}  # token -> set of posting positions
+        self._text_index = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._first_load = threading.Lock()
+        self._refreshing = False
+
+    def search(self, job_title, limit=50):
+        """Postings matching every token of job_title; returns (jobs, state)
+
+        state is 'fresh', 'stale' (served while a refresh runs) or 'miss'
+        (the board had to be downloaded first). Exact title matches rank
+        first, then titles with all the tokens, then descriptions.
+        """
+        state = self._ensure_loaded()
+        tokens = set(tokenize(job_title))
+        if not tokens:
+            return [], state
+        with self._lock:
+            jobs = self._jobs
+            in_title = self._intersect(self._title_index, tokens)
+            in_text = self._intersect(self._text_index, tokens) - in_title
+        phrase = job_title.lower().strip()
+        exact = sorted(i for i in in_title if phrase in jobs[i]['title'].lower())
+        ranked = exact + sorted(in_title - set(exact)) + sorted(in_text)
+        return [dict(jobs[i]) for i in ranked[:limit]], state
+
+    def jobs(self):
+        """Every posting in the snapshot (downloading it first if there is none)"""
+        self._ensure_loaded()
+        with self._lock:
+            return [dict(job) for job in self._jobs]
+
+    def _intersect(self, index, tokens):
+        postings = [index.get(token, set()) for token in tokens]
+        postings.sort(key=len)
+        return set.intersection(*postings) if postings else set()
+
+    def _ensure_loaded(self):
+        if not self._jobs:
+            # Concurrent first searches wait for a single download
+            with self._first_load:
+                if not self._jobs and not self._load_file():
+                    self.refresh()
+                    return 'miss'
+        if time.time() - self._fetched_at > self.refresh_interval:
+            self._refresh_in_background()
+            return 'stale'
+        return 'fresh'
+
+    def _load_file(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if snapshot.get('fetched_at', 0) <= self._fetched_at:
+            return False
+        self._install(snapshot['jobs'], snapshot['fetched_at'])
+        return True
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                # Another worker may already have refreshed the shared file
+                if not self._load_file() or time.time() - self._fetched_at > self.refresh_interval:
+                    self.refresh()
+            except Exception as e:
+                print(f"Arbeitnow snapshot refresh error: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, daemon=True, name='board-snapshot-refresh').start()
+
+    def refresh(self):
+        """Download the board, rebuild the indexes and save the snapshot file"""
+        jobs = self.fetch()
+        fetched_at = time.time()
+        self._install(jobs, fetched_at)
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory or '.', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'fetched_at': fetched_at, 'jobs': jobs}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Arbeitnow snapshot write error: {e}")
+        return len(jobs)
+
+    def _install(self, jobs, fetched_at):
+        title_index = {}
+        text_index = {}
+        for i, job in enumerate(jobs):
+            title_tokens = set(tokenize(job.get('title', '')))
+            text_tokens = title_tokens | set(tokenize(HTML_TAG_PATTERN.sub(' ', job.get('description', ''))))
+            for token in title_tokens:
+                title_index.setdefault(token, set()).add(i)
+            for token in text_tokens:
+                text_index.setdefault(token, set()).add(i)
+        with self._lock:
+            self._jobs = jobs
+            self._title_index = title_index
+            self._text_index = text_index
+            self._fetched_at = fetched_at
+
+    def __len__(self):
+        return len(self._jobs)
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def dedup_key(job):
+    """Same posting from any provider: hash of its normalized title, company and location"""
+    basis = '|'.join(' '.join(WORD_PATTERN.findall((job.get(field) or '').lower()))
+                     for field in ('title', 'company', 'location'))
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()
+
+
+def match_expression(text, column=None):
+    """FTS5 query requiring every word of text, each quoted so user input is never syntax"""
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return None
+    terms = ' AND '.join(f'"{word}"' for word in words)
+    return f"{column} : ({terms})" if column else f"({terms})"
+
+
+class JobStore:
+    """Local full-text catalog of job postings, filled by job_ingest.py.
+
+    Postings are kept in SQLite with an FTS5 index over title, company,
+    location and description (porter-stemmed), keyed by dedup_key so the
+    same posting listed by several providers is stored once. Every
+    posting expires ``ttl`` seconds after it was last seen by an ingest.
+    Searches rank by BM25 with the title weighted highest and page with
+    LIMIT/OFFSET, so /search_jobs can answer without calling providers.
+    """
+
+    def __init__(self, path=None, ttl=None):
+        self.path = path or os.getenv('JOB_STORE_PATH', 'data/job_store.db')
+        self.ttl = ttl if ttl is not None else int(os.getenv('JOB_STORE_TTL', 3 * 24 * 3600))
+        self._lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS postings (
+                rowid INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                job TEXT NOT NULL,
+                source TEXT,
+                seen_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS postings_expires ON postings (expires_at);
+            CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+                title, company, location, description, tokenize='porter unicode61'
+            );
+        """)
+
+    def add_many(self, jobs, ttl=None):
+        """Insert or refresh postings; returns (added, updated)"""
+        now = time.time()
+        expires_at = now + (ttl or self.ttl)
+        added = updated = 0
+        with self._lock, self._db:
+            for job in jobs:
+                key = dedup_key(job)
+                row = self._db.execute("SELECT rowid FROM postings WHERE key = ?", (key,)).fetchone()
+                if row:
+                    rowid = row[0]
+                    self._db.execute("UPDATE postings SET job = ?, source = ?, seen_at = ?, expires_at = ? "
+                                     "WHERE rowid = ?", (json.dumps(job), job.get('source'), now, expires_at, rowid))
+                    self._db.execute("DELETE FROM postings_fts WHERE rowid = ?", (rowid,))
+                    updated += 1
+                else:
+                    rowid = self._db.execute("INSERT INTO postings (key, job, source, seen_at, expires_at) "
+                                             "VALUES (?, ?, ?, ?, ?)",
+                                             (key, json.dumps(job), job.get('source'), now, expires_at)).lastrowid
+                    added += 1
+                description = HTML_TAG_PATTERN.sub(' ', job.get('description') or '')
+                self._db.execute("INSERT INTO postings_fts (rowid, title, company, location, description) "
+                                 "VALUES (?, ?, ?, ?, ?)",
+                                 (rowid, job.get('title') or '', job.get('company') or '',
+                                  job.get('location') or '', description))
+        return added, updated
+
+    def search(self, job_title, location='', page=1, per_page=20):
+        """One page of postings matching every word of job_title (and location), best first.
+
+        Returns {'jobs', 'total', 'page', 'per_page'}.
+        """
+        page = max(1, int(page))
+        per_page = max(1, int(per_page))
+        empty = {'jobs': [], 'total': 0, 'page': page, 'per_page': per_page}
+        expression = match_expression(job_title)
+        if expression is None:
+            return empty
+        location_expression = match_expression(location, 'location')
+        if location_expression:
+            expression = f"{expression} AND {location_expression}"
+        where = "postings_fts MATCH ? AND p.expires_at > ?"
+        params = (expression, time.time())
+        with self._lock:
+            total = self._db.execute(f"SELECT count(*) FROM postings_fts JOIN postings p ON p.rowid = postings_fts.rowid "
+                                     f"WHERE {where}", params).fetchone()[0]
+            if not total:
+                return empty
+            rows = self._db.execute(
+                f"SELECT p.job FROM postings_fts JOIN postings p ON p.rowid = postings_fts.rowid WHERE {where} "
+                f"ORDER BY bm25(postings_fts, 10.0, 2.0, 1.0, 1.0), p.seen_at DESC LIMIT ? OFFSET ?",
+                params + (per_page, (page - 1) * per_page)).fetchall()
+        return {'jobs': [json.loads(row[0]) for row in rows], 'total': total, 'page': page, 'per_page': per_page}
+
+    def purge_expired(self):
+        """Delete postings not seen by an ingest within their TTL; returns how many were removed"""
+        with self._lock, self._db:
+            rowids = [(row[0],) for row in self._db.execute("SELECT rowid FROM postings WHERE expires_at <= ?",
+                                                            (time.time(),))]
+            self._db.executemany("DELETE FROM postings_fts WHERE rowid = ?", rowids)
+            self._db.executemany("DELETE FROM postings WHERE rowid = ?", rowids)
+        return len(rowids)
+
+    def stats(self):
+        with self._lock:
+            total, newest = self._db.execute("SELECT count(*), max(seen_at) FROM postings").fetchone()
+            sources = dict(self._db.execute("SELECT source, count(*) FROM postings GROUP BY source").fetchall())
+        return {'postings': total, 'sources': sources,
+                'last_ingest_age_s': round(time.time() - newest) if newest else None}
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT count(*) FROM postings").fetchone()[0]
+
+    def close(self):
+        self._db.close()
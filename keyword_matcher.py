@@ -0,0 +1,163 @@
+import json
+import re
+from collections import Counter, deque
+
+# Words plus the joiners used by skill names such as "node.js", "c++" and "c#"
+TOKEN_PATTERN = re.compile(r'\w+(?:[.+#]\w+)*[+#]*')
+
+
+def tokenize(text):
+    return [token.lower() for token in TOKEN_PATTERN.findall(text)]
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over word tokens for large keyword and skill dictionaries.
+
+    Terms are compiled once into a trie with failure links, so a text is
+    scanned in a single pass no matter how many terms are loaded. Matching
+    works on whole tokens, which makes it word-boundary aware: "led" does
+    not match inside "skilled". Synonyms are reported under their
+    canonical term.
+    """
+
+    def __init__(self, terms=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # state -> [(canonical, token count)]
+        self._max_tokens = 0
+        self._compiled = False
+        self._canonical = {}
+
+        if isinstance(terms, dict):
+            for canonical, synonyms in terms.items():
+                self.add(canonical)
+                for synonym in synonyms or ():
+                    self.add(synonym, canonical)
+        else:
+            for term in terms:
+                self.add(term)
+        self.compile()
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a taxonomy from JSON ({"canonical": ["synonym", ...]} or a list)
+        or from a text file with one "canonical: synonym, synonym" entry per line"""
+        if path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                return cls(json.load(f))
+
+        taxonomy = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                canonical, _, synonyms = line.partition(':')
+                taxonomy.setdefault(canonical.strip(), []).extend(
+                    s.strip() for s in synonyms.split(',') if s.strip()
+                )
+        return cls(taxonomy)
+
+    def add(self, term, canonical=None):
+        tokens = tokenize(term)
+        if not tokens:
+            return
+        # Same normalization as a plain term, so add('js', 'JavaScript') reports under 'javascript'
+        canonical = ' '.join(tokenize(canonical)) if canonical else ''
+        canonical = canonical or ' '.join(tokens)
+        self._canonical.setdefault(canonical, None)
+
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        if (canonical, len(tokens)) not in self._out[state]:
+            self._out[state].append((canonical, len(tokens)))
+        self._max_tokens = max(self._max_tokens, len(tokens))
+        self._compiled = False
+
+    def compile(self):
+        """Build failure links breadth-first and merge the outputs of suffix states"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(token, 0)
+                for output in self._out[self._fail[next_state]]:
+                    if output not in self._out[next_state]:
+                        self._out[next_state].append(output)
+        self._compiled = True
+
+    @property
+    def canonical_terms(self):
+        return list(self._canonical)
+
+    @property
+    def max_tokens(self):
+        """Token count of the longest term"""
+        return self._max_tokens
+
+    def find(self, text):
+        """Yield (canonical, start, end) character spans for every hit, in text order"""
+        if not self._compiled:
+            self.compile()
+        goto, fail, out = self._goto, self._fail, self._out
+        starts = deque(maxlen=max(self._max_tokens, 1))
+        state = 0
+        for match in TOKEN_PATTERN.finditer(text):
+            token = match.group().lower()
+            starts.append(match.start())
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for canonical, length in out[state]:
+                yield canonical, starts[-length], match.end()
+
+    def match(self, text):
+        """Return {canonical: [(start, end), ...]} for every term found in text"""
+        positions = {}
+        for canonical, start, end in self.find(text):
+            positions.setdefault(canonical, []).append((start, end))
+        return positions
+
+    def counts(self, text):
+        """Return a Counter of canonical term hits"""
+        if self._max_tokens > 1:
+            return Counter(canonical for canonical, _, _ in self.find(text))
+
+        # Single-word dictionaries need no automaton walk: count tokens at C speed and look them up
+        return self.count_tokens(Counter(TOKEN_PATTERN.findall(text.lower())))
+
+    def count_tokens(self, token_counts):
+        """counts() from an already tokenized text ({lowercased token: count});
+        only exact for dictionaries of single-word terms"""
+        root = self._goto[0]
+        if len(root) < len(token_counts):
+            pairs = ((token, token_counts[token]) for token in root if token in token_counts)
+        else:
+            pairs = ((token, n) for token, n in token_counts.items() if token in root)
+        found = Counter()
+        for token, n in pairs:
+            for canonical, _ in self._out[root[token]]:
+                found[canonical] += n
+        return found
+
+    def missing(self, found):
+        """Canonical terms absent from a match()/counts() result, in dictionary order"""
+        return [term for term in self._canonical if term not in found]
+
+    def __len__(self):
+        return len(self._canonical)
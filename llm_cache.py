@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import threading
+
+from cache import LRUCache, SQLiteCache, TieredCache
+
+
+class LLMCache(TieredCache):
+    """Content-addressed cache of chat completions.
+
+    The key is a hash of the model, every message and the sampling
+    parameters, so re-submitting the same resume and job description is
+    answered from memory (or from the SQLite file shared by all workers)
+    without calling the provider. Concurrent misses on the same key wait
+    for the first caller instead of each spending tokens.
+    """
+
+    def __init__(self, path=None, ttl=None, memory_bytes=None, disk_bytes=None):
+        ttl = ttl if ttl is not None else int(os.getenv('LLM_CACHE_TTL', 24 * 3600))
+        memory_bytes = memory_bytes or int(os.getenv('LLM_CACHE_MEMORY_BYTES', 16 * 1024 * 1024))
+        disk_bytes = disk_bytes or int(os.getenv('LLM_CACHE_DISK_BYTES', 128 * 1024 * 1024))
+        path = path or os.getenv('LLM_CACHE_PATH', 'cache/llm_cache.db')
+        super().__init__(
+            LRUCache(max_bytes=memory_bytes, sizeof=lambda text: len(text.encode('utf-8')), ttl=ttl),
+            SQLiteCache(path, max_bytes=disk_bytes, ttl=ttl) if path != ':memory:' else None,
+            encode=lambda text: text.encode('utf-8'),
+            decode=lambda data: data.decode('utf-8'),
+        )
+        self._in_flight = {}  # key -> Event set when the first caller is done
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model, messages, **params):
+        payload = json.dumps({'model': model, 'messages': messages, 'params': params},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_or_create(self, key, create):
+        """Cached value for key, else create() once per key across concurrent callers"""
+        while True:
+            value = self.get(key)
+            if value is not None:
+                return value
+            with self._lock:
+                event = self._in_flight.get(key)
+                if event is None:
+                    event = self._in_flight[key] = threading.Event()
+                    break
+            # Someone else is generating this completion; use theirs (or retry if they failed)
+            event.wait()
+
+        try:
+            value = create()
+            if value:
+                self.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            event.set()
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Process-wide LLMCache, created on first use; LLM_CACHE_ENABLED=false disables it"""
+    global _shared_cache
+    if os.getenv('LLM_CACHE_ENABLED', 'true').lower() in ('0', 'false', 'no'):
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMCache()
+        return _shared_cache
+
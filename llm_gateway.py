@@ -0,0 +1,342 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import httpx
+from groq import APIConnectionError, APIStatusError, APITimeoutError, Groq
+
+from llm_cache import LLMCache, get_llm_cache
+
+# Lower numbers are served first when calls queue for rate-limit capacity
+PRIORITIES = {'interactive': 0, 'batch': 1}
+
+
+def estimate_tokens(messages, max_tokens=0):
+    """Rough token cost of a request: ~4 characters per prompt token plus the completion budget"""
+    return sum(len(message.get('content') or '') for message in messages) // 4 + (max_tokens or 0)
+
+
+class TokenBucket:
+    """Capacity refilled continuously at ``rate`` units per second, up to ``capacity``"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until ``amount`` is available (0 if it is available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount):
+        """Remove amount (at most a full bucket); returns how much was actually taken"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        self.level -= amount
+        return amount
+
+    def give_back(self, amount):
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a model whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Failure-rate and slow-call-rate breaker over a sliding window of recent calls.
+
+    closed: calls go through and their outcomes are recorded. Once at least
+    ``min_calls`` outcomes in the last ``window`` seconds are in and either
+    the failure rate or the rate of calls slower than ``slow_call_seconds``
+    reaches its threshold, the breaker opens.
+    open: calls fail immediately with CircuitOpenError for ``open_seconds``.
+    half_open: up to ``probes`` trial calls are let through; a success
+    closes the breaker, a failure opens it again.
+    """
+
+    def __init__(self, name, failure_rate=None, slow_call_rate=None, slow_call_seconds=None,
+                 min_calls=None, window=None, open_seconds=None, probes=1):
+        self.name = name
+        self.failure_rate = failure_rate or float(os.getenv('LLM_BREAKER_FAILURE_RATE', 0.5))
+        self.slow_call_rate = slow_call_rate or float(os.getenv('LLM_BREAKER_SLOW_CALL_RATE', 0.8))
+        self.slow_call_seconds = slow_call_seconds or float(os.getenv('LLM_BREAKER_SLOW_CALL_SECONDS', 15))
+        self.min_calls = min_calls or int(os.getenv('LLM_BREAKER_MIN_CALLS', 5))
+        self.window = window or float(os.getenv('LLM_BREAKER_WINDOW', 60))
+        self.open_seconds = open_seconds or float(os.getenv('LLM_BREAKER_OPEN_SECONDS', 30))
+        self.probes = probes
+        self.state = 'closed'
+        self._outcomes = deque()  # (timestamp, failed, slow)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.times_opened = 0
+
+    def allow(self):
+        """Whether a call may go out now; counts a probe slot when half-open"""
+        with self._lock:
+            if self.state == 'open':
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self.state = 'half_open'
+                self._probes_in_flight = 0
+            if self.state == 'half_open':
+                if self._probes_in_flight >= self.probes:
+                    self.rejected += 1
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def record(self, failed, seconds):
+        with self._lock:
+            now = time.monotonic()
+            if self.state == 'half_open':
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed:
+                    self._open(now)
+                else:
+                    self.state = 'closed'
+                    self._outcomes.clear()
+                return
+            self._outcomes.append((now, failed, seconds >= self.slow_call_seconds))
+            while self._outcomes and now - self._outcomes[0][0] > self.window:
+                self._outcomes.popleft()
+            if self.state == 'closed' and len(self._outcomes) >= self.min_calls:
+                failures = sum(1 for _, failed, _ in self._outcomes if failed)
+                slow = sum(1 for _, _, slow in self._outcomes if slow)
+                if (failures / len(self._outcomes) >= self.failure_rate
+                        or slow / len(self._outcomes) >= self.slow_call_rate):
+                    self._open(now)
+
+    def _open(self, now):
+        self.state = 'open'
+        self._opened_at = now
+        self._outcomes.clear()
+        self.times_opened += 1
+        print(f"LLM circuit breaker for {self.name} opened; failing fast for {self.open_seconds}s")
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)) if self.state == 'open' else 0.0
+            return {
+                'state': self.state,
+                'recent_calls': len(self._outcomes),
+                'recent_failures': sum(1 for _, failed, _ in self._outcomes if failed),
+                'recent_slow_calls': sum(1 for _, _, slow in self._outcomes if slow),
+                'times_opened': self.times_opened,
+                'rejected': self.rejected,
+                'retry_in_seconds': round(retry_in, 1),
+            }
+
+
+class LLMGateway:
+    """Process-wide entry point for chat completions.
+
+    One pooled keep-alive HTTP client is shared by every caller. Each call
+    waits its turn for capacity in two token buckets, one counting requests
+    and one counting (estimated) tokens per minute, and waiting calls are
+    admitted highest priority first, so interactive requests overtake
+    queued batch work. 429s, 5xx answers and connection errors are retried
+    with jittered exponential backoff, honouring Retry-After. Each model
+    has a CircuitBreaker: while it is open calls fail at once, so callers
+    fall back without waiting on an outage. Answers go through the shared
+    LLMCache, which keeps serving repeated prompts during an outage.
+
+    LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE are the limits of the
+    whole API key. Every gunicorn worker has its own gateway, so each one
+    gets 1/LLM_PROCESSES of them (WEB_CONCURRENCY by default, the variable
+    gunicorn takes its worker count from). LLM_REQUEST_BURST requests may
+    start at once (10 by default, the largest fan-out: five cover letter
+    tones with an industry pass each), capped at the worker's per-minute
+    share, with a matching share of the token budget.
+    """
+
+    def __init__(self, api_key=None, base_url=None, requests_per_minute=None, tokens_per_minute=None,
+                 max_connections=None, max_retries=None, timeout=None, cache=None):
+        processes = max(1, int(os.getenv('LLM_PROCESSES', os.getenv('WEB_CONCURRENCY', 1))))
+        requests_per_minute = requests_per_minute or float(os.getenv('LLM_REQUESTS_PER_MINUTE', 30)) / processes
+        tokens_per_minute = tokens_per_minute or float(os.getenv('LLM_TOKENS_PER_MINUTE', 30000)) / processes
+        burst = min(max(1.0, float(os.getenv('LLM_REQUEST_BURST', 10))), max(1.0, requests_per_minute))
+        max_connections = max_connections or int(os.getenv('LLM_MAX_CONNECTIONS', 20))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('LLM_MAX_RETRIES', 3))
+        timeout = timeout or float(os.getenv('LLM_TIMEOUT', 60))
+
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                                keepalive_expiry=60),
+            timeout=httpx.Timeout(timeout, connect=5.0),
+        )
+        # Retries are done here, where they are rate limited, not inside the client
+        self.client = Groq(api_key=api_key or os.getenv('GROQ_API_KEY'), base_url=base_url,
+                           http_client=self.http_client, max_retries=0)
+        self.cache = cache
+        self.requests = TokenBucket(requests_per_minute / 60, burst)
+        # The token bucket holds the same fraction of a minute as the request burst
+        self.tokens = TokenBucket(tokens_per_minute / 60,
+                                  max(1.0, tokens_per_minute * min(1.0, burst / requests_per_minute)))
+        self._condition = threading.Condition()
+        self._waiting = []  # heap of (priority, ticket)
+        self._tickets = itertools.count()
+        self._stats = {'calls': 0, 'retries': 0, 'failures': 0, 'throttled_seconds': 0.0}
+        self._breakers = {}  # model -> CircuitBreaker
+
+    def breaker(self, model):
+        with self._condition:
+            breaker = self._breakers.get(model)
+            if breaker is None:
+                breaker = self._breakers[model] = CircuitBreaker(model)
+            return breaker
+
+    def complete(self, messages, model, priority='interactive', **params):
+        """Text of a chat completion, from the cache or the provider"""
+        def create():
+            response = self._call(messages, model, priority, params)
+            return response.choices[0].message.content
+
+        if self.cache is None:
+            return create()
+        return self.cache.get_or_create(LLMCache.key(model, messages, **params), create)
+
+    def stream(self, messages, model, priority='interactive', **params):
+        """Yield a completion's text as it is generated; cached answers arrive as one chunk.
+
+        Retries only happen before the first chunk; the finished text is cached.
+        """
+        key = LLMCache.key(model, messages, **params)
+        if self.cache is not None:
+            value = self.cache.get(key)
+            if value is not None:
+                yield value
+                return
+
+        parts = []
+        for chunk in self._call(messages, model, priority, dict(params, stream=True)):
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+        if self.cache is not None and parts:
+            self.cache.set(key, ''.join(parts))
+
+    def _call(self, messages, model, priority, params):
+        cost = estimate_tokens(messages, params.get('max_tokens'))
+        breaker = self.breaker(model)
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"circuit breaker open for {model}")
+            taken = self._acquire(PRIORITIES.get(priority, PRIORITIES['batch']), cost)
+            started = time.monotonic()
+            try:
+                response = self.client.chat.completions.create(messages=messages, model=model, **params)
+            except (APIStatusError, APIConnectionError, APITimeoutError) as e:
+                status = getattr(e, 'status_code', None)
+                retryable = status is None or status == 429 or status >= 500
+                # A 4xx other than 429 is a problem with this request, not with the model
+                breaker.record(failed=retryable, seconds=time.monotonic() - started)
+                if not retryable or attempt == self.max_retries:
+                    with self._condition:
+                        self._stats['failures'] += 1
+                    raise
+                with self._condition:
+                    self._stats['retries'] += 1
+                time.sleep(self._backoff(attempt, e))
+                continue
+            except Exception:
+                breaker.record(failed=True, seconds=time.monotonic() - started)
+                raise
+            breaker.record(failed=False, seconds=time.monotonic() - started)
+
+            usage = getattr(response, 'usage', None)
+            if usage is not None and getattr(usage, 'total_tokens', None):
+                # Settle what was taken from the bucket against what the provider actually counted
+                with self._condition:
+                    self.tokens.give_back(taken - usage.total_tokens)
+                    self._condition.notify_all()
+            return response
+
+    def _backoff(self, attempt, error):
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), 30.0) + random.uniform(0, 0.25)
+        except ValueError:
+            pass
+        # Full jitter: spreads retries from many callers instead of synchronising them
+        return random.uniform(0, min(8.0, 0.5 * 2 ** attempt))
+
+    def _acquire(self, priority, cost):
+        """Block until this call is the highest-priority waiter and both buckets have capacity;
+        returns the tokens taken, which is cost capped at the bucket's capacity"""
+        entry = (priority, next(self._tickets))
+        started = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    if self._waiting[0] == entry:
+                        delay = max(self.requests.wait_time(1), self.tokens.wait_time(cost))
+                        if delay == 0:
+                            self.requests.take(1)
+                            taken = self.tokens.take(cost)
+                            break
+                        self._condition.wait(delay)
+                    else:
+                        self._condition.wait()
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._stats['calls'] += 1
+                self._stats['throttled_seconds'] += time.monotonic() - started
+                self._condition.notify_all()
+        return taken
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self._stats, queued=len(self._waiting),
+                         throttled_seconds=round(self._stats['throttled_seconds'], 3),
+                         requests_available=round(self.requests.level, 2),
+                         tokens_available=round(self.tokens.level))
+            breakers = list(self._breakers.items())
+        stats['breakers'] = {model: breaker.snapshot() for model, breaker in breakers}
+        return stats
+
+    def close(self):
+        self.http_client.close()
+
+
+_gateways = {}
+_gateways_lock = threading.Lock()
+
+
+def get_gateway(api_key=None):
+    """Process-wide LLMGateway for an API key (GROQ_API_KEY by default), created on first use"""
+    api_key = api_key or os.getenv('GROQ_API_KEY')
+    with _gateways_lock:
+        gateway = _gateways.get(api_key)
+        if gateway is None:
+            gateway = _gateways[api_key] = LLMGateway(api_key=api_key, cache=get_llm_cache())
+        return gateway
+
+
+def gateway_stats():
+    with _gateways_lock:
+        gateways = list(_gateways.values())
+    return [gateway.stats() for gateway in gateways]
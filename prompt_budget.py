@@ -0,0 +1,94 @@
+import re
+import threading
+
+# Roughly four characters per token, the same estimate the LLM gateway uses
+CHARS_PER_TOKEN = 4
+# Paragraphs longer than this are split into sentences so they can be ranked separately
+MAX_CHUNK_CHARS = 400
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+# "EXPERIENCE", "Technical Skills:", "Requirements" - short lines that give a document its structure
+HEADING_PATTERN = re.compile(r'^[A-Za-z][A-Za-z &/]{0,40}:?$')
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def shared_model():
+    """Process-wide TfidfModel, loaded on first use; the analyzer and the cover letter
+    generator pass it to compress() so each worker holds a single copy"""
+    global _model
+    with _model_lock:
+        if _model is None:
+            from tfidf_model import TfidfModel
+            _model = TfidfModel.load_or_hashing()
+        return _model
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN
+
+
+def split_chunks(text):
+    """Lines/bullets of a resume or job description, with long paragraphs split into sentences"""
+    chunks = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if len(line) <= MAX_CHUNK_CHARS:
+            chunks.append(line)
+            continue
+        current = ''
+        for sentence in SENTENCE_PATTERN.split(line):
+            if current and len(current) + len(sentence) + 1 > MAX_CHUNK_CHARS:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def is_heading(chunk):
+    return len(chunk.split()) <= 4 and bool(HEADING_PATTERN.match(chunk))
+
+
+def compress(text, reference=None, budget_tokens=400, keep_head=1, keep_headings=True, model=None):
+    """Fit text into about ``budget_tokens`` tokens, keeping the chunks most relevant to reference.
+
+    Chunks are ranked by TF-IDF cosine similarity with the reference document
+    (or, without one, with the text as a whole, which favours substance over
+    headers and boilerplate) and packed greedily into the budget. The first
+    ``keep_head`` lines, usually the candidate's name and headline, and
+    (with ``keep_headings``) section headings are kept as long as they fit.
+    Selected chunks are returned in their original order.
+    """
+    if not text or estimate_tokens(text) <= budget_tokens:
+        return text
+    chunks = split_chunks(text)
+    budget = budget_tokens * CHARS_PER_TOKEN
+
+    selected = set()
+    used = 0
+    pinned = [i for i, chunk in enumerate(chunks) if i < keep_head or (keep_headings and is_heading(chunk))]
+    for i in pinned:
+        if used + len(chunks[i]) + 1 <= budget:
+            selected.add(i)
+            used += len(chunks[i]) + 1
+
+    model = model or shared_model()
+    matrix = model.transform(chunks + [reference or text])
+    scores = (matrix[:-1] @ matrix[-1].T).toarray().ravel()
+    for i in sorted(range(len(chunks)), key=lambda i: (-scores[i], i)):
+        if i in selected:
+            continue
+        size = len(chunks[i]) + 1
+        if used + size <= budget:
+            selected.add(i)
+            used += size
+
+    if not selected:
+        # A single chunk larger than the whole budget: fall back to cutting it
+        return chunks[0][:budget]
+    return '\n'.join(chunks[i] for i in sorted(selected))
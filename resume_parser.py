@@ -3,46 +3,224 @@ try:
     from docx import Document
 except ImportError:
     raise ImportError("python-docx is required. Install with: pip install python-docx")
+import hashlib
 import io
+import os
+import zipfile
+from xml.etree.ElementTree import ParseError, XMLPullParser
+from cache import DiskCache, LRUCache, TieredCache
+from executors import get_executor
+
+
+def _env_int(name, default=None):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def _extract_pdf_page_range(data, start, stop):
+    """Extract the text of pages [start, stop) from in-memory PDF bytes (process pool worker)"""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+class ExtractionCache(TieredCache):
+    """Extracted resume text keyed by the SHA-256 of the uploaded bytes"""
+
+    def __init__(self, cache_dir=None, memory_bytes=None, disk_bytes=None):
+        cache_dir = cache_dir or os.getenv('EXTRACTION_CACHE_DIR', 'cache/extraction')
+        memory_bytes = memory_bytes or _env_int('EXTRACTION_CACHE_MEMORY_BYTES', 16 * 1024 * 1024)
+        disk_bytes = disk_bytes or _env_int('EXTRACTION_CACHE_DISK_BYTES', 256 * 1024 * 1024)
+        super().__init__(
+            LRUCache(max_bytes=memory_bytes),
+            DiskCache(cache_dir, max_bytes=disk_bytes),
+            encode=lambda text: text.encode('utf-8'),
+            decode=lambda data: data.decode('utf-8'),
+        )
+
 
 class ResumeParser:
+    # Part of the extraction cache key: bump it when a change here alters the extracted text,
+    # so cached text from the old code is not served (PyPDF2 upgrades change the key too)
+    EXTRACTOR_VERSION = 2
+
+    def __init__(self, max_pages=None, max_chars=None, workers=None, pages_per_task=4, parallel_min_pages=8, cache=None):
+        # Optional early stop: the analyzers mostly care about the first pages
+        self.max_pages = max_pages if max_pages is not None else _env_int('RESUME_MAX_PAGES')
+        self.max_chars = max_chars if max_chars is not None else _env_int('RESUME_MAX_CHARS')
+        # workers > 1 enables page-parallel extraction for long PDFs
+        self.workers = workers if workers is not None else _env_int('PDF_EXTRACT_WORKERS', 0)
+        self.pages_per_task = max(1, pages_per_task)
+        self.parallel_min_pages = parallel_min_pages
+        self.cache = cache
+
     def extract_text(self, uploaded_file):
         """Extract text from PDF or DOCX files"""
+        kind = self._detect_file_kind(uploaded_file)
+        stream = self._seekable_stream(uploaded_file)
+        if self.cache is None:
+            return self._extract(kind, stream)
+
+        # Identical uploads are served from the cache without touching PyPDF2/python-docx
+        key = (f"{self._content_digest(stream)}-{kind}-{self.max_pages or 0}-{self.max_chars or 0}"
+               f"-v{self.EXTRACTOR_VERSION}-pypdf2-{PyPDF2.__version__}")
+        text = self.cache.get(key)
+        if text is None:
+            text = self._extract(kind, stream)
+            self.cache.set(key, text)
+        return text
+
+    def _detect_file_kind(self, uploaded_file):
         # Get file type from content type or filename
         file_type = getattr(uploaded_file, 'content_type', None) or getattr(uploaded_file, 'type', None)
-        filename = getattr(uploaded_file, 'filename', '')
+        filename = (getattr(uploaded_file, 'filename', '') or '').lower()
         
         # Determine file type from extension if content type is not available
         if not file_type and filename:
-            if filename.lower().endswith('.pdf'):
+            if filename.endswith('.pdf'):
                 file_type = "application/pdf"
-            elif filename.lower().endswith('.docx'):
+            elif filename.endswith('.docx'):
                 file_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            elif filename.lower().endswith('.txt'):
-                return uploaded_file.read().decode('utf-8')
+            elif filename.endswith('.txt'):
+                file_type = "text/plain"
         
-        if file_type == "application/pdf" or (filename and filename.lower().endswith('.pdf')):
-            return self._extract_from_pdf(uploaded_file)
-        elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document" or (filename and filename.lower().endswith('.docx')):
-            return self._extract_from_docx(uploaded_file)
-        elif file_type == "text/plain" or (filename and filename.lower().endswith('.txt')):
-            return uploaded_file.read().decode('utf-8')
+        if file_type == "application/pdf" or filename.endswith('.pdf'):
+            return 'pdf'
+        elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document" or filename.endswith('.docx'):
+            return 'docx'
+        elif file_type == "text/plain" or filename.endswith('.txt'):
+            return 'txt'
         else:
             raise ValueError(f"Unsupported file type: {file_type}. Please upload PDF, DOCX, or TXT files.")
-    
+
+    def _extract(self, kind, stream):
+        if kind == 'pdf':
+            return self._extract_from_pdf(stream)
+        elif kind == 'docx':
+            return self._extract_from_docx(stream)
+        return stream.read().decode('utf-8')
+
+    def _content_digest(self, stream):
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: stream.read(64 * 1024), b''):
+            digest.update(chunk)
+        stream.seek(0)
+        return digest.hexdigest()
+
+    def iter_pdf_pages(self, file, max_pages=None):
+        """Lazily yield the text of each PDF page in order"""
+        max_pages = max_pages if max_pages is not None else self.max_pages
+        stream = self._seekable_stream(file)
+        reader = PyPDF2.PdfReader(stream)
+        page_count = len(reader.pages)
+        if max_pages:
+            page_count = min(page_count, max_pages)
+
+        if self.workers > 1 and page_count >= self.parallel_min_pages:
+            stream.seek(0)
+            yield from self._iter_pdf_pages_parallel(stream.read(), page_count)
+            return
+
+        for i in range(page_count):
+            yield reader.pages[i].extract_text() or ""
+
+    def _iter_pdf_pages_parallel(self, data, page_count):
+        """Extract page ranges in a process pool and yield them back in page order"""
+        executor = get_executor('pdf-extract', self.workers, processes=True)
+        futures = [
+            executor.submit(_extract_pdf_page_range, data, start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            # Early stop by the consumer: drop ranges that have not started yet
+            for future in futures:
+                future.cancel()
+
+    def _seekable_stream(self, file):
+        stream = getattr(file, 'stream', file)
+        try:
+            if stream.seekable():
+                stream.seek(0)
+                return stream
+        except (AttributeError, ValueError, OSError):
+            pass
+        return io.BytesIO(file.read())
+
     def _extract_from_pdf(self, file):
         # amazonq-ignore-next-line
         """Extract text from PDF"""
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file.read()))
-            return "".join(page.extract_text() for page in pdf_reader.pages)
+            parts = []
+            length = 0
+            for page_text in self.iter_pdf_pages(file):
+                parts.append(page_text)
+                length += len(page_text)
+                if self.max_chars and length >= self.max_chars:
+                    break
+            return "".join(parts)
         except Exception as e:
             raise ValueError(f"Error reading PDF file: {str(e)}")
-    
+
+    def iter_docx_paragraphs(self, file, chunk_size=64 * 1024):
+        """Stream paragraph and table cell text out of word/document.xml in document order"""
+        stream = self._seekable_stream(file)
+        with zipfile.ZipFile(stream) as archive, archive.open('word/document.xml') as xml_file:
+            parser = XMLPullParser(events=('start', 'end'))
+            parents = []
+            paragraphs = []  # text parts of the open (possibly nested) paragraphs
+            cells = []       # finished paragraphs of the open table cells
+            for chunk in iter(lambda: xml_file.read(chunk_size), b''):
+                parser.feed(chunk)
+                for event, elem in parser.read_events():
+                    if event == 'start':
+                        parents.append(elem)
+                        if elem.tag == _W + 'p':
+                            paragraphs.append([])
+                        elif elem.tag == _W + 'tc':
+                            cells.append([])
+                        continue
+
+                    parents.pop()
+                    tag = elem.tag
+                    if tag == _W + 't' and paragraphs:
+                        paragraphs[-1].append(elem.text or '')
+                    elif tag == _W + 'tab' and paragraphs and parents and parents[-1].tag == _W + 'r':
+                        # Only a tab in a run is text; w:pPr/w:tabs/w:tab are tab stop definitions
+                        paragraphs[-1].append('\t')
+                    elif tag in (_W + 'br', _W + 'cr') and paragraphs:
+                        paragraphs[-1].append('\n')
+                    elif tag == _W + 'p':
+                        text = ''.join(paragraphs.pop())
+                        if cells:
+                            cells[-1].append(text)
+                        else:
+                            yield text
+                    elif tag == _W + 'tc':
+                        text = ' '.join(part for part in cells.pop() if part)
+                        if cells:
+                            cells[-1].append(text)
+                        else:
+                            yield text
+
+                    # Drop finished subtrees so memory stays bounded by the current paragraph
+                    if parents:
+                        parents[-1].remove(elem)
+            parser.close()
+
     def _extract_from_docx(self, file):
         """Extract text from DOCX"""
         try:
-            doc = Document(io.BytesIO(file.read()))
+            return "\n".join(self.iter_docx_paragraphs(file))
+        except (KeyError, zipfile.BadZipFile, ParseError) as e:
+            print(f"Streaming DOCX extraction failed, falling back to python-docx: {e}")
+
+        try:
+            doc = Document(self._seekable_stream(file))
             return "\n".join(paragraph.text for paragraph in doc.paragraphs)
         except Exception as e:
-            raise ValueError(f"Error reading DOCX file: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Error reading DOCX file: {str(e)}")
@@ -0,0 +1,64 @@
+import os
+import pickle
+import secrets
+import time
+import zlib
+
+from cache import LRUCache, SQLiteCache, TieredCache
+
+
+class ResumeSessionStore:
+    """Server-side storage for uploaded resumes; the session cookie only holds the id.
+
+    A record is the resume text plus artifacts derived from it (ATS score,
+    feedback, keywords and TF-IDF vector), pickled and zlib-compressed. It
+    lives in an in-memory LRU capped at ``memory_bytes`` in front of a
+    SQLite file shared by every worker. Records expire after ``idle_ttl``
+    seconds without a request; each read older than ``touch_interval``
+    pushes the expiry back.
+    """
+
+    def __init__(self, path=None, idle_ttl=None, memory_bytes=None, disk_bytes=None, touch_interval=60):
+        self.idle_ttl = idle_ttl or int(os.getenv('RESUME_SESSION_IDLE_TTL', 24 * 3600))
+        self.touch_interval = min(touch_interval, self.idle_ttl / 2)
+        memory_bytes = memory_bytes or int(os.getenv('RESUME_SESSION_MEMORY_BYTES', 32 * 1024 * 1024))
+        disk_bytes = disk_bytes or int(os.getenv('RESUME_SESSION_DISK_BYTES', 256 * 1024 * 1024))
+        path = path or os.getenv('RESUME_SESSION_PATH', 'cache/resume_sessions.db')
+        self.cache = TieredCache(
+            LRUCache(max_bytes=memory_bytes, ttl=self.idle_ttl),
+            SQLiteCache(path, max_bytes=disk_bytes, ttl=self.idle_ttl) if path != ':memory:' else None,
+        )
+
+    def create(self, resume_text, **artifacts):
+        """Store a new resume; returns its id"""
+        resume_id = secrets.token_urlsafe(16)
+        self._save({'id': resume_id, 'resume_text': resume_text, 'artifacts': artifacts})
+        return resume_id
+
+    def get(self, resume_id):
+        """{'id', 'resume_text', 'artifacts'} or None if unknown or idle for too long"""
+        data = self.cache.get(resume_id)
+        if data is None:
+            return None
+        record = pickle.loads(zlib.decompress(data))
+        if time.time() - record['touched_at'] > self.touch_interval:
+            self._save(record)
+        return record
+
+    def update(self, resume_id, **artifacts):
+        """Add or replace derived artifacts of a stored resume"""
+        record = self.get(resume_id)
+        if record is not None:
+            record['artifacts'].update(artifacts)
+            self._save(record)
+        return record
+
+    def delete(self, resume_id):
+        self.cache.delete(resume_id)
+
+    def _save(self, record):
+        record['touched_at'] = time.time()
+        self.cache.set(record['id'], zlib.compress(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)))
+
+    def stats(self):
+        return self.cache.stats()
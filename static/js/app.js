@@ -196,55 +196,33 @@ document.getElementById('coverLetterForm').addEventListener('submit', async (e)
     resultsDiv.innerHTML = getLoadingSpinner('Crafting your personalized cover letter...');
     
     try {
-        const response = await fetch('/generate_cover_letter', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
-                company_name: companyName,
-                position: position,
-                job_description: jobDesc,
-                tone: tone
-            })
+        // Tokens are shown as they arrive; without streaming support this is the plain JSON request
+        let streamedText = null;
+        const result = await postStreaming('/generate_cover_letter', {
+            company_name: companyName,
+            position: position,
+            job_description: jobDesc,
+            tone: tone
+        }, (delta) => {
+            if (streamedText === null) {
+                streamedText = '';
+                renderCoverLetter(resultsDiv, companyName, position, tone, '');
+            }
+            streamedText += delta;
+            const textarea = resultsDiv.querySelector('textarea');
+            textarea.value = streamedText;
+            textarea.scrollTop = textarea.scrollHeight;
         });
         
-        const result = await response.json();
-        
         if (result.cover_letter) {
-            resultsDiv.innerHTML = `
-                <div class="card animate-fade-in">
-                    <div class="card-header bg-gradient-info text-white">
-                        <h4><i class="fas fa-envelope pulse"></i> Generated Cover Letter</h4>
-                    </div>
-                    <div class="card-body">
-                        <div class="mb-3 animate-slide-in">
-                            <div class="d-flex flex-wrap gap-2">
-                                <span class="badge bg-primary">Company: ${companyName}</span>
-                                <span class="badge bg-success">Position: ${position}</span>
-                                <span class="badge bg-info">Tone: ${tone}</span>
-                            </div>
-                        </div>
-                        <div class="position-relative">
-                            <textarea class="form-control mb-3 animate-slide-in" rows="20" readonly>${result.cover_letter}</textarea>
-                            <div class="typing-indicator" style="display: none;"></div>
-                        </div>
-                        <div class="d-grid gap-2 animate-slide-in">
-                            <button class="btn btn-primary btn-hover-effect" onclick="downloadCoverLetter('${companyName}', \`${result.cover_letter.replace(/`/g, '\\`')}\`)">
-                                <i class="fas fa-download"></i> Download Cover Letter
-                            </button>
-                            <button class="btn btn-outline-secondary btn-hover-effect" onclick="copyToClipboard(\`${result.cover_letter.replace(/`/g, '\\`')}\`)">
-                                <i class="fas fa-copy"></i> Copy to Clipboard
-                            </button>
-                        </div>
-                    </div>
-                </div>
-            `;
+            renderCoverLetter(resultsDiv, companyName, position, tone, result.cover_letter);
             
-            // Simulate typing effect for the textarea
-            setTimeout(() => {
-                simulateTyping(resultsDiv.querySelector('textarea'), result.cover_letter);
-            }, 500);
+            if (streamedText === null) {
+                // Simulate typing effect for the textarea
+                setTimeout(() => {
+                    simulateTyping(resultsDiv.querySelector('textarea'), result.cover_letter);
+                }, 500);
+            }
             
         } else {
             showAlert('Error: ' + (result.error || 'Unknown error'), 'danger');
@@ -274,101 +252,69 @@ document.getElementById('jobSearchForm').addEventListener('submit', async (e) =>
     showLoading(submitBtn, 'Searching Jobs...');
     resultsDiv.innerHTML = getLoadingSpinner('Searching for the best job opportunities...');
     
+    // Cards are added as each provider answers instead of after the slowest one
+    let shown = 0;
+    const appendJobs = (jobs) => {
+        if (!jobs || jobs.length === 0) return;
+        if (shown === 0) {
+            resultsDiv.innerHTML = renderJobSearchHeader(jobTitle, location, experienceLevel) +
+                '<div class="job-results-list"></div>';
+        }
+        const list = resultsDiv.querySelector('.job-results-list');
+        jobs.forEach((job, index) => {
+            list.insertAdjacentHTML('beforeend', renderJobCard(job, index));
+        });
+        shown += jobs.length;
+        resultsDiv.querySelector('.job-count').textContent = `${shown} Job${shown > 1 ? 's' : ''}`;
+    };
+    
+    const showMore = (done) => {
+        const oldButton = resultsDiv.querySelector('.load-more-jobs');
+        if (oldButton) oldButton.remove();
+        if (!done.next_cursor) return;
+        resultsDiv.querySelector('.job-count').textContent = `${shown} of ${done.total} Jobs`;
+        resultsDiv.insertAdjacentHTML('beforeend', `
+            <button class="secondary-action-btn load-more-jobs">
+                <i class="fas fa-chevron-down"></i>
+                <span>Show More Jobs</span>
+            </button>
+        `);
+        resultsDiv.querySelector('.load-more-jobs').addEventListener('click', async (event) => {
+            const button = event.currentTarget;
+            showLoading(button, 'Loading...');
+            try {
+                const next = await postNdjson('/search_jobs/stream', {cursor: done.next_cursor}, (line) => {
+                    appendJobs(line.jobs);
+                });
+                if (next.error) {
+                    showAlert('Error: ' + next.error, 'danger');
+                    hideLoading(button, 'Show More Jobs');
+                } else {
+                    showMore(next);
+                }
+            } catch (error) {
+                showAlert('Loading more jobs failed: ' + error.message, 'danger');
+                hideLoading(button, 'Show More Jobs');
+            }
+        });
+    };
+    
     try {
-        const response = await fetch('/search_jobs', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
-                job_title: jobTitle,
-                location: location,
-                experience_level: experienceLevel
-            })
+        const done = await postNdjson('/search_jobs/stream', {
+            job_title: jobTitle,
+            location: location,
+            experience_level: experienceLevel
+        }, (line) => {
+            appendJobs(line.jobs);
         });
         
-        const result = await response.json();
-        
-        if (result.jobs && result.jobs.length > 0) {
-            let jobsHtml = `
-                <div class="search-header animate-fade-in">
-                    <div class="search-results-title">
-                        <h4><i class="fas fa-briefcase text-primary"></i> Found ${result.jobs.length} Job${result.jobs.length > 1 ? 's' : ''}</h4>
-                        <div class="search-query">
-                            <span class="query-tag"><i class="fas fa-search"></i> ${jobTitle}</span>
-                            ${location ? `<span class="location-tag"><i class="fas fa-map-marker-alt"></i> ${location}</span>` : ''}
-                            <span class="level-tag"><i class="fas fa-layer-group"></i> ${experienceLevel.replace('_', ' ').replace(/\b\w/g, l => l.toUpperCase())}</span>
-                        </div>
-                    </div>
-                </div>
-            `;
-            
-            result.jobs.forEach((job, index) => {
-                jobsHtml += `
-                    <div class="enhanced-job-card animate-slide-in" style="animation-delay: ${index * 0.1}s">
-                        <div class="job-card-header">
-                            <div class="job-title-section">
-                                <h5 class="job-title">${job.title}</h5>
-                                <div class="company-info">
-                                    <i class="fas fa-building company-icon"></i>
-                                    <span class="company-name">${job.company}</span>
-                                </div>
-                            </div>
-                            <div class="job-source-badge">
-                                <span class="source-tag">${job.source}</span>
-                            </div>
-                        </div>
-                        
-                        <div class="job-meta-info">
-                            <div class="meta-item">
-                                <i class="fas fa-map-marker-alt meta-icon"></i>
-                                <span class="meta-label">Location:</span>
-                                <span class="meta-value">${job.location}</span>
-                            </div>
-                            <div class="meta-item">
-                                <i class="fas fa-dollar-sign meta-icon"></i>
-                                <span class="meta-label">Salary:</span>
-                                <span class="meta-value">${job.salary}</span>
-                            </div>
-                        </div>
-                        
-                        <div class="job-description">
-                            <p class="description-text">${job.description.substring(0, 200)}...</p>
-                        </div>
-                        
-                        <div class="job-actions-enhanced">
-                            <a href="${job.url}" target="_blank" class="primary-action-btn">
-                                <i class="fas fa-external-link-alt"></i>
-                                <span>View Full Job</span>
-                            </a>
-                            <button class="secondary-action-btn" onclick="copyJobDetails('${job.title}', '${job.company}', '${job.location}')">
-                                <i class="fas fa-copy"></i>
-                                <span>Copy Details</span>
-                            </button>
-                        </div>
-                    </div>
-                `;
-            });
-            
-            resultsDiv.innerHTML = jobsHtml;
+        if (done.error) {
+            showAlert('Error: ' + done.error, 'danger');
+            if (shown === 0) resultsDiv.innerHTML = '';
+        } else if (shown === 0) {
+            resultsDiv.innerHTML = renderNoJobsFound();
         } else {
-            resultsDiv.innerHTML = `
-                <div class="empty-state enhanced-empty-state">
-                    <div class="empty-icon">
-                        <i class="fas fa-search-minus"></i>
-                    </div>
-                    <h4 class="empty-title">No Jobs Found</h4>
-                    <p class="empty-description">We couldn't find any jobs matching your criteria.</p>
-                    <div class="empty-suggestions">
-                        <h6>Try these suggestions:</h6>
-                        <ul class="suggestion-list">
-                            <li><i class="fas fa-lightbulb"></i> Use broader search terms</li>
-                            <li><i class="fas fa-map"></i> Expand your location search</li>
-                            <li><i class="fas fa-clock"></i> Check back later for new postings</li>
-                        </ul>
-                    </div>
-                </div>
-            `;
+            showMore(done);
         }
     } catch (error) {
         showAlert('Job search failed: ' + error.message, 'danger');
@@ -378,7 +324,226 @@ document.getElementById('jobSearchForm').addEventListener('submit', async (e) =>
     }
 });
 
+function renderJobSearchHeader(jobTitle, location, experienceLevel) {
+    return `
+        <div class="search-header animate-fade-in">
+            <div class="search-results-title">
+                <h4><i class="fas fa-briefcase text-primary"></i> Found <span class="job-count"></span></h4>
+                <div class="search-query">
+                    <span class="query-tag"><i class="fas fa-search"></i> ${jobTitle}</span>
+                    ${location ? `<span class="location-tag"><i class="fas fa-map-marker-alt"></i> ${location}</span>` : ''}
+                    <span class="level-tag"><i class="fas fa-layer-group"></i> ${experienceLevel.replace('_', ' ').replace(/\b\w/g, l => l.toUpperCase())}</span>
+                </div>
+            </div>
+        </div>
+    `;
+}
+
+function renderJobCard(job, index) {
+    return `
+        <div class="enhanced-job-card animate-slide-in" style="animation-delay: ${index * 0.1}s">
+            <div class="job-card-header">
+                <div class="job-title-section">
+                    <h5 class="job-title">${job.title}</h5>
+                    <div class="company-info">
+                        <i class="fas fa-building company-icon"></i>
+                        <span class="company-name">${job.company}</span>
+                    </div>
+                </div>
+                <div class="job-source-badge">
+                    <span class="source-tag">${job.source}</span>
+                </div>
+            </div>
+            
+            <div class="job-meta-info">
+                <div class="meta-item">
+                    <i class="fas fa-map-marker-alt meta-icon"></i>
+                    <span class="meta-label">Location:</span>
+                    <span class="meta-value">${job.location}</span>
+                </div>
+                <div class="meta-item">
+                    <i class="fas fa-dollar-sign meta-icon"></i>
+                    <span class="meta-label">Salary:</span>
+                    <span class="meta-value">${job.salary}</span>
+                </div>
+            </div>
+            
+            <div class="job-description">
+                <p class="description-text">${job.description.substring(0, 200)}...</p>
+            </div>
+            
+            <div class="job-actions-enhanced">
+                <a href="${job.url}" target="_blank" class="primary-action-btn">
+                    <i class="fas fa-external-link-alt"></i>
+                    <span>View Full Job</span>
+                </a>
+                <button class="secondary-action-btn" onclick="copyJobDetails('${job.title}', '${job.company}', '${job.location}')">
+                    <i class="fas fa-copy"></i>
+                    <span>Copy Details</span>
+                </button>
+            </div>
+        </div>
+    `;
+}
+
+function renderNoJobsFound() {
+    return `
+        <div class="empty-state enhanced-empty-state">
+            <div class="empty-icon">
+                <i class="fas fa-search-minus"></i>
+            </div>
+            <h4 class="empty-title">No Jobs Found</h4>
+            <p class="empty-description">We couldn't find any jobs matching your criteria.</p>
+            <div class="empty-suggestions">
+                <h6>Try these suggestions:</h6>
+                <ul class="suggestion-list">
+                    <li><i class="fas fa-lightbulb"></i> Use broader search terms</li>
+                    <li><i class="fas fa-map"></i> Expand your location search</li>
+                    <li><i class="fas fa-clock"></i> Check back later for new postings</li>
+                </ul>
+            </div>
+        </div>
+    `;
+}
+
 // Enhanced Helper Functions with Visual Effects
+function renderCoverLetter(resultsDiv, companyName, position, tone, coverLetter) {
+    resultsDiv.innerHTML = `
+        <div class="card animate-fade-in">
+            <div class="card-header bg-gradient-info text-white">
+                <h4><i class="fas fa-envelope pulse"></i> Generated Cover Letter</h4>
+            </div>
+            <div class="card-body">
+                <div class="mb-3 animate-slide-in">
+                    <div class="d-flex flex-wrap gap-2">
+                        <span class="badge bg-primary">Company: ${companyName}</span>
+                        <span class="badge bg-success">Position: ${position}</span>
+                        <span class="badge bg-info">Tone: ${tone}</span>
+                    </div>
+                </div>
+                <div class="position-relative">
+                    <textarea class="form-control mb-3 animate-slide-in" rows="20" readonly>${coverLetter}</textarea>
+                    <div class="typing-indicator" style="display: none;"></div>
+                </div>
+                <div class="d-grid gap-2 animate-slide-in">
+                    <button class="btn btn-primary btn-hover-effect" onclick="downloadCoverLetter('${companyName}', \`${coverLetter.replace(/`/g, '\\`')}\`)">
+                        <i class="fas fa-download"></i> Download Cover Letter
+                    </button>
+                    <button class="btn btn-outline-secondary btn-hover-effect" onclick="copyToClipboard(\`${coverLetter.replace(/`/g, '\\`')}\`)">
+                        <i class="fas fa-copy"></i> Copy to Clipboard
+                    </button>
+                </div>
+            </div>
+        </div>
+    `;
+}
+
+// POST JSON asking for Server-Sent Events and call onDelta with each text chunk as it arrives.
+// Resolves to the same object the JSON endpoint returns. Browsers without readable streams, and
+// answers that come back as plain JSON (validation errors, servers without streaming), take the
+// ordinary JSON path.
+async function postStreaming(url, payload, onDelta) {
+    const canStream = Boolean(window.ReadableStream && window.TextDecoder);
+    const headers = {'Content-Type': 'application/json'};
+    if (canStream) {
+        headers['Accept'] = 'text/event-stream';
+    }
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: headers,
+        body: JSON.stringify(payload)
+    });
+    
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!canStream || !response.body || !contentType.includes('text/event-stream')) {
+        return response.json();
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let result = null;
+    while (true) {
+        const {done, value} = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, {stream: true});
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const event = parseServerSentEvent(buffer.slice(0, boundary));
+            buffer = buffer.slice(boundary + 2);
+            if (event.type === 'done' || event.type === 'error') {
+                result = event.data;
+            } else if (event.data.delta) {
+                onDelta(event.data.delta);
+            }
+        }
+    }
+    return result || {error: 'The response ended before it was complete'};
+}
+
+async function postNdjson(url, payload, onLine) {
+    // Calls onLine for every line but the last; returns the last ('done' or 'error')
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(payload)
+    });
+    
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!contentType.includes('application/x-ndjson')) {
+        return response.json();
+    }
+    
+    let last = null;
+    const handle = (text) => {
+        if (!text.trim()) return;
+        const line = JSON.parse(text);
+        if (line.done || line.error) {
+            last = line;
+        } else {
+            onLine(line);
+        }
+    };
+    if (!response.body || !window.TextDecoder) {
+        (await response.text()).split('\n').forEach(handle);
+        return last || {error: 'The response ended before it was complete'};
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const {done, value} = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, {stream: true});
+        let newline;
+        while ((newline = buffer.indexOf('\n')) !== -1) {
+            handle(buffer.slice(0, newline));
+            buffer = buffer.slice(newline + 1);
+        }
+        if (last) {
+            // The server may still be saving results; everything the page needs is here
+            reader.cancel();
+            break;
+        }
+    }
+    if (!last) handle(buffer);
+    return last || {error: 'The response ended before it was complete'};
+}
+
+function parseServerSentEvent(block) {
+    let type = 'message';
+    const data = [];
+    block.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) {
+            type = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+            data.push(line.slice(5).trim());
+        }
+    });
+    return {type: type, data: data.length ? JSON.parse(data.join('\n')) : {}};
+}
+
 function showLoading(button, text) {
     button.disabled = true;
     button.innerHTML = `<i class="fas fa-spinner fa-spin"></i> ${text}`;
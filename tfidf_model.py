@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Pre-fit TF-IDF model for resume / job description similarity.
+
+The vocabulary and IDF weights are fitted once, offline, on a corpus of
+resumes and job postings; requests only call ``transform``:
+
+    python tfidf_model.py resumes/ postings.jsonl -o models/tfidf
+    python tfidf_model.py postings.jsonl -o models/tfidf --mode hashing
+
+The IDF vector is stored as a .npy file and loaded memory-mapped, so every
+gunicorn worker shares one copy of it through the page cache. In hashing
+mode there is no vocabulary at all and the mapped IDF array is the whole
+model. Without a trained model, ``TfidfModel.load_or_hashing`` falls back
+to stateless hashed term frequencies.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.preprocessing import normalize
+
+DEFAULT_MODEL_PATH = 'models/tfidf'
+NGRAM_RANGE = (1, 2)
+HASHING_FEATURES = 2 ** 20
+
+
+def _count_vectorizer(vocabulary=None, max_features=None, min_df=1):
+    return CountVectorizer(stop_words='english', ngram_range=NGRAM_RANGE, vocabulary=vocabulary,
+                           max_features=max_features, min_df=min_df)
+
+
+def _hashing_vectorizer(n_features):
+    return HashingVectorizer(stop_words='english', ngram_range=NGRAM_RANGE, n_features=n_features,
+                             alternate_sign=False, norm=None)
+
+
+class TfidfModel:
+    """TF-IDF transform with a fixed vocabulary (or feature hashing) and precomputed IDF weights"""
+
+    def __init__(self, vectorizer, idf=None, mode='vocabulary'):
+        self.vectorizer = vectorizer
+        self.idf = idf
+        self.mode = mode
+        self._signature = None
+
+    @property
+    def signature(self):
+        """Identifies the model's weights, for caches and indexes that store its vectors"""
+        if self._signature is None:
+            digest = hashlib.sha1(f"{self.mode}:{self.n_features}".encode('utf-8'))
+            if self.idf is not None:
+                digest.update(np.ascontiguousarray(self.idf).data)
+            self._signature = digest.hexdigest()[:16]
+        return self._signature
+
+    @property
+    def n_features(self):
+        if self.mode == 'hashing':
+            return self.vectorizer.n_features
+        return len(self.vectorizer.vocabulary)
+
+    def transform(self, texts):
+        """L2-normalised TF-IDF rows (scipy CSR) for texts, without refitting anything"""
+        matrix = self.vectorizer.transform(texts).astype(np.float64)
+        if self.idf is not None:
+            matrix.data *= self.idf[matrix.indices]
+        return normalize(matrix, copy=False)
+
+    def similarity(self, text_a, text_b):
+        """Cosine similarity of two texts (rows are unit length, so a dot product suffices)"""
+        matrix = self.transform([text_a, text_b])
+        return float(matrix[0].multiply(matrix[1]).sum())
+
+    @classmethod
+    def hashing(cls, n_features=HASHING_FEATURES):
+        """Stateless model: hashed term frequencies with no IDF weighting"""
+        return cls(_hashing_vectorizer(n_features), mode='hashing')
+
+    @classmethod
+    def fit(cls, texts, mode='vocabulary', max_features=50000, min_df=2, n_features=HASHING_FEATURES):
+        texts = list(texts)
+        if mode == 'hashing':
+            vectorizer = _hashing_vectorizer(n_features)
+            counts = vectorizer.transform(texts)
+        else:
+            vectorizer = _count_vectorizer(max_features=max_features, min_df=min_df if len(texts) > 1 else 1)
+            counts = vectorizer.fit_transform(texts)
+            # Keep only the fitted vocabulary so the model can be rebuilt without refitting
+            vectorizer = _count_vectorizer(vocabulary=vectorizer.vocabulary_)
+
+        # Same smoothed IDF as TfidfVectorizer's defaults
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1
+        return cls(vectorizer, idf, mode)
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        meta = {'mode': self.mode, 'ngram_range': list(NGRAM_RANGE), 'n_features': self.n_features}
+        if self.mode != 'hashing':
+            with open(os.path.join(path, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+                json.dump({term: int(index) for term, index in self.vectorizer.vocabulary.items()}, f)
+        np.save(os.path.join(path, 'idf.npy'), np.asarray(self.idf, dtype=np.float64))
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        idf = np.load(os.path.join(path, 'idf.npy'), mmap_mode='r' if mmap else None)
+        if meta['mode'] == 'hashing':
+            return cls(_hashing_vectorizer(meta['n_features']), idf, 'hashing')
+        with open(os.path.join(path, 'vocabulary.json'), encoding='utf-8') as f:
+            vocabulary = json.load(f)
+        return cls(_count_vectorizer(vocabulary=vocabulary), idf, 'vocabulary')
+
+    @classmethod
+    def load_or_hashing(cls, path=None):
+        path = path or os.getenv('TFIDF_MODEL_PATH', DEFAULT_MODEL_PATH)
+        if os.path.exists(os.path.join(path, 'meta.json')):
+            try:
+                return cls.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Could not load TF-IDF model from {path}: {e}")
+        return cls.hashing()
+
+
+def iter_corpus(paths):
+    """Yield documents from .txt files, directories of them, and JSON/JSONL job or resume dumps"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                yield from iter_corpus(os.path.join(root, name) for name in sorted(files))
+        elif path.endswith('.jsonl'):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield _document_text(json.loads(line))
+        elif path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                for record in json.load(f):
+                    yield _document_text(record)
+        elif path.endswith('.txt'):
+            with open(path, encoding='utf-8', errors='ignore') as f:
+                yield f.read()
+
+
+def _document_text(record):
+    if isinstance(record, str):
+        return record
+    return ' '.join(str(record.get(field, '')) for field in ('title', 'description', 'text', 'resume_text'))
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Fit the TF-IDF model used for job matching")
+    arg_parser.add_argument('corpus', nargs='+', help="Directories of .txt files, .json or .jsonl dumps")
+    arg_parser.add_argument('-o', '--output', default=DEFAULT_MODEL_PATH)
+    arg_parser.add_argument('--mode', choices=('vocabulary', 'hashing'), default='vocabulary')
+    arg_parser.add_argument('--max-features', type=int, default=50000)
+    arg_parser.add_argument('--min-df', type=int, default=2)
+    args = arg_parser.parse_args(argv)
+
+    model = TfidfModel.fit(iter_corpus(args.corpus), mode=args.mode,
+                           max_features=args.max_features, min_df=args.min_df)
+    model.save(args.output)
+    print(f"Saved {args.mode} TF-IDF model with {model.n_features} features to {args.output}")
+
+
+if __name__ == '__main__':
+    main()